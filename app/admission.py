@@ -0,0 +1,122 @@
+import time
+from enum import IntEnum
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class Priority(IntEnum):
+    CRITICAL = 0  # e.g. login: never starved by bulk traffic
+    WRITE = 1
+    BULK_READ = 2
+
+
+# fraction of the adaptive limit each priority class may occupy
+PRIORITY_SHARE = {
+    Priority.CRITICAL: 1.0,
+    Priority.WRITE: 0.85,
+    Priority.BULK_READ: 0.7,
+}
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit driven by observed request latency.
+
+    Every request that finishes under the latency target grows the limit by
+    `1 / limit` (about +1 per limit's worth of requests); a slow request
+    shrinks it by `backoff`, at most once per target interval so a burst of
+    slow completions does not collapse it to the floor.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        backoff: float = 0.9,
+    ) -> None:
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._last_decrease = 0.0
+
+    def on_sample(self, latency: float, inflight: int) -> None:
+        now = time.monotonic()
+        if latency > self.latency_target:
+            if now - self._last_decrease >= self.latency_target:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif inflight >= self.limit / 2:
+            # only grow when the limit is actually being used
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class AdmissionControlMiddleware:
+    """Bound in-flight requests per worker and shed the excess with a fast 503.
+
+    Requests are classified into priority classes; lower classes may only use
+    part of the adaptive limit, so login keeps working while bulk reads are
+    being shed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target_ms: int,
+        retry_after_seconds: int = 1,
+        critical_paths: tuple[str, ...] = ("/auth/login",),
+        exempt_paths: tuple[str, ...] = (),
+    ) -> None:
+        self.app = app
+        self.limit = AdaptiveLimit(
+            initial_limit, min_limit, max_limit, latency_target_ms / 1000
+        )
+        self.retry_after_seconds = retry_after_seconds
+        self.critical_paths = frozenset(critical_paths)
+        self.exempt_paths = frozenset(exempt_paths)
+        self.inflight = 0
+        self.rejected = 0
+
+    def classify(self, scope: Scope) -> Priority:
+        if scope["path"] in self.critical_paths:
+            return Priority.CRITICAL
+        if scope["method"] in ("GET", "HEAD"):
+            return Priority.BULK_READ
+        return Priority.WRITE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.classify(scope)
+        if self.inflight >= self.limit.limit * PRIORITY_SHARE[priority]:
+            self.rejected += 1
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "error": "Service overloaded",
+                    "message": "The server is busy. Please retry shortly.",
+                    "retry_after": self.retry_after_seconds,
+                },
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.inflight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            inflight = self.inflight
+            self.inflight -= 1
+            self.limit.on_sample(time.perf_counter() - start, inflight)
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import UTC, datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .background import PeriodicTask
+from .database import AsyncSessionLocal
+from .env_loader import settings
+from .models.audit import AuditEvent
+
+
+class AuditLog:
+    """Write-behind audit trail.
+
+    `record` only enqueues onto a bounded queue and never waits: when the
+    queue is full the event is dropped and counted. A background writer
+    drains the queue in multi-row INSERT batches, is woken early once a full
+    batch is waiting, and drains whatever is left on shutdown.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float) -> None:
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue)
+        self.writer = PeriodicTask("audit-writer", self.flush, flush_interval)
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def record(
+        self,
+        action: str,
+        *,
+        actor_id: int | str | None = None,
+        target_type: str | None = None,
+        target_id: int | str | None = None,
+        detail: dict | None = None,
+    ) -> None:
+        event = {
+            "action": action,
+            "actor_id": int(actor_id) if actor_id is not None else None,
+            "target_type": target_type,
+            "target_id": int(target_id) if target_id is not None else None,
+            "detail": detail,
+            "created_at": datetime.now(UTC),
+        }
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self.writer.trigger()
+
+    def take_batch(self) -> list[dict]:
+        batch: list[dict] = []
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def write(self, db: AsyncSession) -> int:
+        """Drain the queue into `db` in multi-row INSERT batches."""
+        written = 0
+        while batch := self.take_batch():
+            try:
+                await db.execute(insert(AuditEvent.__table__), batch)
+                await db.commit()
+            except Exception:
+                self.dropped += len(batch)
+                raise
+            written += len(batch)
+        return written
+
+    async def flush(self) -> None:
+        async with AsyncSessionLocal() as db:
+            await self.write(db)
+
+
+audit_log = AuditLog(
+    max_queue=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_seconds,
+)
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -5,14 +6,24 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..audit import audit_log
 from ..database import get_db
+from ..deadline import deadline
 from ..dependencies import current_user_dependency
+from ..env_loader import settings
 from ..limiter import limiter
+from ..models.users import User
+from ..revocation import revocation_list
 from ..schemas.user import UserCreateSchema, UserLoginSchema, UserReadSchema
 from .utilits import (
+    REFRESH_COOKIE,
+    REFRESH_COOKIE_PATH,
     authenticate_user,
     build_login_response,
+    create_refresh_token,
     create_user_token,
+    decode_refresh_token,
+    token_expiry,
 )
 from .utilits import (
     hash_password as func_hash_password,
@@ -26,6 +37,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
     "/register", response_model=UserReadSchema, status_code=status.HTTP_201_CREATED
 )
 @limiter.limit("5/minute")
+@deadline(10)
 async def register_user(
     request: Request,
     register_data: UserCreateSchema,
@@ -39,7 +51,9 @@ async def register_user(
 
     # Create user models for schemas
     user = register_data.to_model(
-        hashed_password=func_hash_password(register_data.password)
+        hashed_password=await asyncio.to_thread(
+            func_hash_password, register_data.password
+        )
     )
 
     # insert into db
@@ -53,12 +67,16 @@ async def register_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": "User with this email already exists."},
         )
+    audit_log.record(
+        "user.register", actor_id=user.id, target_type="user", target_id=user.id
+    )
     return UserCreateSchema.model_validate(user)
 
 
 # login user
 @router.post("/login", status_code=status.HTTP_200_OK)
 @limiter.limit("5/minute")
+@deadline(10)
 async def login_user(
     request: Request,
     login_data: UserLoginSchema,
@@ -67,28 +85,83 @@ async def login_user(
     """
     User login endpoint <br>
     """
-    user = await authenticate_user(db, login_data.email, login_data.password)
+    try:
+        user = await authenticate_user(db, login_data.email, login_data.password)
+    except HTTPException:
+        audit_log.record("user.login_failed", detail={"email": login_data.email})
+        raise
+    audit_log.record(
+        "user.login", actor_id=user.id, target_type="user", target_id=user.id
+    )
     access_token = create_user_token(user)
     request.state.user = user
-    return build_login_response(access_token)
+    return build_login_response(access_token, create_refresh_token(user))
+
+
+# rotate tokens
+@router.post("/refresh", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute")
+@deadline(10)
+async def refresh_tokens(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> JSONResponse:
+    """
+    Trade the refresh cookie for a new access/refresh pair. <br>
+    Each refresh token works once; replaying it is rejected.
+    """
+    payload = decode_refresh_token(request.cookies.get(REFRESH_COOKIE))
+    user = await db.get(User, int(payload["id"])) if payload else None
+    # revoking first makes concurrent replays of one token lose the race
+    if (
+        user is None
+        or payload is None
+        or not await revocation_list.revoke(db, payload["jti"], token_expiry(payload))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+        )
+    return build_login_response(
+        create_user_token(user),
+        create_refresh_token(user),
+        message="Tokens refreshed",
+    )
 
 
 # Logout user
 @router.post("/logout", status_code=status.HTTP_200_OK)
 @limiter.limit("5/minute")
+@deadline(10)
 async def logout_user(
     request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
     # ensures only logged-in users can reach this code
     user_data: Annotated[dict, Depends(current_user_dependency)],
 ) -> JSONResponse:
     """
-    User logout endpoint.
+    User logout endpoint. Revokes the access and refresh tokens.
     """
+    if "jti" in user_data:
+        await revocation_list.revoke(db, user_data["jti"], token_expiry(user_data))
+    refresh = decode_refresh_token(request.cookies.get(REFRESH_COOKIE))
+    if refresh is not None and refresh.get("id") == user_data.get("id"):
+        await revocation_list.revoke(db, refresh["jti"], token_expiry(refresh))
     response = JSONResponse(
         content={"message": f"Goodbye {user_data.get('name')}, successfully logged out"}
     )
     response.delete_cookie(
-        key="access_token", httponly=True, secure=True, samesite="lax"
+        key="access_token",
+        httponly=True,
+        secure=settings.cookie_secure,
+        samesite="lax",
+    )
+    response.delete_cookie(
+        key=REFRESH_COOKIE,
+        path=REFRESH_COOKIE_PATH,
+        httponly=True,
+        secure=settings.cookie_secure,
+        samesite="strict",
     )
     request.state.user = None
     return response
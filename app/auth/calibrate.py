@@ -0,0 +1,129 @@
+"""Pick Argon2id cost parameters for this host and store them in `.env`.
+
+Memory cost is what makes GPU cracking expensive, so it is kept at the
+allowed maximum (`--max-memory-mib`) and the time cost is raised until one
+hash takes about `--target-ms`; only if a single pass at that memory is
+already too slow is memory halved, down to `--min-memory-mib`. Each login
+holds a thread for that long, so a core handles roughly 1000 / ms logins per
+second; pick the target with the expected login rate in mind.
+
+Hashes made with other parameters keep working and are rehashed with the
+new ones at the user's next login.
+
+    python -m app.auth.calibrate [--target-ms 250] [--max-memory-mib 64]
+                                 [--parallelism 1] [--write .env]
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from ..env_loader import settings
+
+
+class Argon2Params(NamedTuple):
+    time_cost: int
+    memory_cost_kib: int
+    parallelism: int
+    ms: float
+
+    def env(self) -> dict[str, str]:
+        return {
+            "argon2_time_cost": str(self.time_cost),
+            "argon2_memory_cost_kib": str(self.memory_cost_kib),
+            "argon2_parallelism": str(self.parallelism),
+        }
+
+
+def measure(time_cost: int, memory_kib: int, parallelism: int, samples: int) -> float:
+    """Median milliseconds to hash one password with these parameters."""
+    hasher = Argon2Hasher(
+        time_cost=time_cost, memory_cost=memory_kib, parallelism=parallelism
+    )
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("calibration password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float,
+    max_memory_kib: int,
+    min_memory_kib: int,
+    parallelism: int,
+    samples: int = 3,
+) -> Argon2Params:
+    memory = max_memory_kib
+    one_pass = measure(1, memory, parallelism, samples)
+    while one_pass > target_ms and memory > min_memory_kib:
+        memory = max(memory // 2, min_memory_kib)
+        one_pass = measure(1, memory, parallelism, samples)
+
+    # time grows linearly with passes: estimate, then check downwards
+    time_cost = max(1, int(target_ms // one_pass))
+    ms = measure(time_cost, memory, parallelism, samples)
+    while time_cost > 1 and ms > target_ms:
+        time_cost -= 1
+        ms = measure(time_cost, memory, parallelism, samples)
+    return Argon2Params(time_cost, memory, parallelism, ms)
+
+
+def update_env_file(path: Path, values: dict[str, str]) -> None:
+    """Set `key=value` lines in an env file, keeping everything else as is."""
+    lines = path.read_text().splitlines() if path.exists() else []
+    pending = dict(values)
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip().lower()
+        if "=" in line and key in pending:
+            lines[i] = f"{key}={pending.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in pending.items())
+    path.write_text("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.auth.calibrate")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--max-memory-mib", type=int, default=64)
+    # OWASP's floor for Argon2id
+    parser.add_argument("--min-memory-mib", type=int, default=19)
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=settings.argon2_parallelism,
+        help="lanes per hash; concurrent logins already use the other cores",
+    )
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--write", type=Path, metavar="ENV_FILE")
+    args = parser.parse_args()
+
+    current = measure(
+        settings.argon2_time_cost,
+        settings.argon2_memory_cost_kib,
+        settings.argon2_parallelism,
+        args.samples,
+    )
+    params = calibrate(
+        args.target_ms,
+        args.max_memory_mib * 1024,
+        args.min_memory_mib * 1024,
+        args.parallelism,
+        args.samples,
+    )
+    print(  # noqa: T201
+        f"current: t={settings.argon2_time_cost} m={settings.argon2_memory_cost_kib}KiB"
+        f" p={settings.argon2_parallelism} -> {current:.0f} ms\n"
+        f"tuned:   t={params.time_cost} m={params.memory_cost_kib}KiB"
+        f" p={params.parallelism} -> {params.ms:.0f} ms"
+        f" (~{1000 / params.ms:.1f} logins/s per core)"
+    )
+    if args.write:
+        update_env_file(args.write, params.env())
+        print(f"wrote {args.write}")  # noqa: T201
+    else:
+        print("\n".join(f"{k}={v}" for k, v in params.env().items()))  # noqa: T201
@@ -0,0 +1,170 @@
+"""JWT signing keys, tagged by `kid`, and the JWKS document that publishes them.
+
+Keys are PEM private keys (Ed25519 -> EdDSA, RSA -> RS256) named `<kid>.pem`
+in `settings.jwt_keys_dir`. The active key signs new tokens; every key in the
+directory still verifies, so rotating is: add a key, make it active, and
+delete the old one once its tokens have expired. Downstream services verify
+locally against `/.well-known/jwks.json` and refetch it on an unknown `kid`.
+
+Without a key directory tokens are signed with `settings.secret_key`, as
+before. Asymmetric keys need `cryptography` (`pip install "pyjwt[crypto]"`);
+it is only imported when keys are configured.
+
+    python -m app.auth.keys generate keys/ [--rsa]
+"""
+
+import argparse
+import hashlib
+import json
+import secrets
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import jwt
+from jwt.exceptions import InvalidTokenError
+from pydantic import SecretStr
+
+from ..env_loader import settings
+
+
+class SigningKey(NamedTuple):
+    kid: str
+    algorithm: str
+    private_key: Any
+    public_key: Any
+
+
+def load_signing_key(path: Path) -> SigningKey:
+    try:
+        from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+        from cryptography.hazmat.primitives.serialization import (
+            load_pem_private_key,
+        )
+    except ImportError as exc:
+        raise RuntimeError(
+            'JWT signing keys need cryptography: pip install "pyjwt[crypto]"'
+        ) from exc
+
+    private_key = load_pem_private_key(path.read_bytes(), password=None)
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        algorithm = "EdDSA"
+    elif isinstance(private_key, rsa.RSAPrivateKey):
+        algorithm = "RS256"
+    else:
+        raise ValueError(f"Unsupported JWT key type in {path.name}")
+    return SigningKey(path.stem, algorithm, private_key, private_key.public_key())
+
+
+def public_jwk(key: SigningKey) -> dict:
+    jwk = jwt.get_algorithm_by_name(key.algorithm).to_jwk(key.public_key, as_dict=True)
+    return {**jwk, "kid": key.kid, "alg": key.algorithm, "use": "sig"}
+
+
+class KeyRing:
+    """Signs with the active key and verifies by the token's `kid`.
+
+    Tokens without a `kid` were signed with the shared secret; they are
+    accepted while `accept_shared_secret` is on, which is always the case
+    when no keys are configured.
+    """
+
+    def __init__(
+        self,
+        keys: list[SigningKey],
+        active_kid: str | None,
+        secret_key: SecretStr,
+        algorithm: str,
+        accept_shared_secret: bool = True,
+    ) -> None:
+        self._keys = {key.kid: key for key in keys}
+        if active_kid is None and keys:
+            active_kid = max(self._keys)
+        if active_kid is not None and active_kid not in self._keys:
+            raise ValueError(f"Active JWT key '{active_kid}' is not in the keyring")
+        self.active = self._keys.get(active_kid) if active_kid else None
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.accept_shared_secret = accept_shared_secret or not keys
+        # keys only change on restart, so the document is built once
+        self.jwks_json = json.dumps(
+            {"keys": [public_jwk(key) for key in self._keys.values()]}
+        ).encode()
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_json).hexdigest()[:16]}"'
+
+    @classmethod
+    def from_settings(cls) -> "KeyRing":
+        keys = []
+        if settings.jwt_keys_dir:
+            paths = sorted(Path(settings.jwt_keys_dir).glob("*.pem"))
+            keys = [load_signing_key(path) for path in paths]
+        return cls(
+            keys,
+            settings.jwt_active_kid,
+            settings.secret_key,
+            settings.algorithm,
+            settings.jwt_accept_shared_secret,
+        )
+
+    def encode(self, payload: dict) -> str:
+        if self.active is None:
+            return jwt.encode(
+                payload, self.secret_key.get_secret_value(), self.algorithm
+            )
+        return jwt.encode(
+            payload,
+            self.active.private_key,
+            self.active.algorithm,
+            headers={"kid": self.active.kid},
+        )
+
+    def decode(self, token: str) -> dict:
+        """Verified payload; raises `InvalidTokenError` otherwise."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if not self.accept_shared_secret:
+                raise InvalidTokenError("Token has no key id")
+            return jwt.decode(
+                token, self.secret_key.get_secret_value(), algorithms=[self.algorithm]
+            )
+        key = self._keys.get(kid)
+        if key is None:
+            raise InvalidTokenError(f"Unknown key id '{kid}'")
+        # the key decides the algorithm, never the token header
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+
+keyring = KeyRing.from_settings()
+
+
+def generate_key(directory: Path, rsa_key: bool = False) -> Path:
+    """Write a new private key; its timestamp kid sorts after older keys."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if rsa_key:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    directory.mkdir(parents=True, exist_ok=True)
+    kid = f"{time.strftime('%Y%m%d%H%M%S')}-{secrets.token_hex(2)}"
+    path = directory / f"{kid}.pem"
+    path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    path.chmod(0o600)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.auth.keys")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="create a new signing key")
+    generate.add_argument("directory", type=Path)
+    generate.add_argument("--rsa", action="store_true", help="RS256 instead of EdDSA")
+    args = parser.parse_args()
+    print(generate_key(args.directory, rsa_key=args.rsa))  # noqa: T201
@@ -1,19 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+import uuid
 from datetime import datetime, timedelta, timezone
 
 import jwt
 from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 from pydantic import SecretStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..dependencies import verify_access_token
 from ..env_loader import settings
 from ..models.users import User
+from .keys import keyring
+
+# cost parameters come from settings; tune them with `python -m app.auth.calibrate`
+hashed_hasdher = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=settings.argon2_time_cost,
+            memory_cost=settings.argon2_memory_cost_kib,
+            parallelism=settings.argon2_parallelism,
+        ),
+    )
+)
 
-hashed_hasdher = PasswordHash.recommended()
+REFRESH_COOKIE = "refresh_token"
+# the refresh cookie is only sent to /auth/refresh and /auth/logout
+REFRESH_COOKIE_PATH = "/auth"
 
 
 def hash_password(plain_password: str) -> str:
@@ -26,6 +44,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return hashed_hasdher.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify; also return a new hash if the stored one uses outdated parameters."""
+    return hashed_hasdher.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(
     data: dict,
     secret_key: SecretStr,
@@ -42,43 +67,100 @@ def create_access_token(
     return jwt.encode(to_encode, secret_key.get_secret_value(), algorithm)
 
 
+def issue_token(data: dict, expires_delta: timedelta) -> str:
+    """Sign with the keyring's active key (the shared secret if none is set)."""
+    return keyring.encode({**data, "exp": datetime.now(timezone.utc) + expires_delta})
+
+
 # Utils for login endpoint
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> User:
     statement = select(User).where(User.email == email)
     result = await db.execute(statement)
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        # Argon2 is deliberately slow; keep it off the event loop
+        valid, new_hash = await asyncio.to_thread(
+            verify_and_update_password, password, user.hashed_password
+        )
+    if not user or not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
+    if new_hash is not None:
+        # parameters were retuned since this hash was made: upgrade it now,
+        # while we have the plain password
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 
+def new_token_id() -> str:
+    return uuid.uuid4().hex
+
+
+def token_expiry(payload: dict) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], timezone.utc)
+
+
 def create_user_token(user: User) -> str:
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    return create_access_token(
-        data={
+    """Short-lived access token; renewed through /auth/refresh."""
+    return issue_token(
+        {
             "sub": str(user.email),
             "role": str(user.role),
             "id": str(user.id),
             "name": user.name,
+            "type": "access",
+            "jti": new_token_id(),
         },
-        secret_key=settings.secret_key,
-        algorithm=settings.algorithm,
-        expires_delta=access_token_expires,
+        timedelta(minutes=settings.access_token_expire_minutes),
     )
 
 
-def build_login_response(token: str) -> JSONResponse:
-    response = JSONResponse(content={"message": "Successfully logged in"})
+def create_refresh_token(user: User) -> str:
+    """Single-use token that buys a new access/refresh pair."""
+    return issue_token(
+        {
+            "sub": str(user.email),
+            "id": str(user.id),
+            "type": "refresh",
+            "jti": new_token_id(),
+        },
+        timedelta(days=settings.refresh_token_expire_days),
+    )
+
+
+def decode_refresh_token(token: str | None) -> dict | None:
+    if not token:
+        return None
+    payload = verify_access_token(token)
+    if payload is None or payload.get("type") != "refresh":
+        return None
+    return payload
+
+
+def build_login_response(
+    token: str, refresh_token: str, message: str = "Successfully logged in"
+) -> JSONResponse:
+    response = JSONResponse(content={"message": message})
     response.set_cookie(
         key="access_token",
         value=token,
         httponly=True,
-        secure=False,  # TODO: True in production
+        secure=settings.cookie_secure,
         samesite="lax",
         max_age=settings.access_token_expire_minutes * 60,
     )
+    response.set_cookie(
+        key=REFRESH_COOKIE,
+        value=refresh_token,
+        httponly=True,
+        secure=settings.cookie_secure,
+        samesite="strict",
+        path=REFRESH_COOKIE_PATH,
+        max_age=settings.refresh_token_expire_days * 24 * 60 * 60,
+    )
     return response
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run `fn` every `interval` seconds until stopped, then once more.
+
+    Started and stopped from the app `lifespan`. Stopping never interrupts a
+    run in progress, and the final run on stop lets write-behind buffers
+    flush what they hold before the worker exits. `trigger()` wakes the task
+    early, e.g. when a buffer fills up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Awaitable[None]],
+        interval: float,
+        run_at_start: bool = False,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.run_at_start = run_at_start
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._wakeup.clear()
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    def trigger(self) -> None:
+        self._wakeup.set()
+
+    async def stop(self, final_run: bool = True) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        if final_run:
+            await self.run_once()
+
+    async def run_once(self) -> None:
+        try:
+            await self.fn()
+        except Exception:
+            logger.exception("background task %s failed", self.name)
+
+    async def _run(self) -> None:
+        if self.run_at_start:
+            await self.run_once()
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self._stopping:
+                await self.run_once()
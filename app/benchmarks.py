@@ -0,0 +1,271 @@
+"""Microbenchmarks for the per-request building blocks.
+
+    python -m app.benchmarks [--filter token] [--repeat 15] [--min-time 0.05]
+                             [--save bench.json] [--compare bench.json]
+                             [--threshold 10]
+
+Each case is warmed up, then timed over `--repeat` rounds; a round calls the
+function enough times to last at least `--min-time` seconds, with the garbage
+collector off so a collection doesn't land in one round only. The median
+round gives ops/sec, the spread between rounds says how far to trust it.
+Allocations are measured in a separate pass under `tracemalloc` (tracing
+slows allocation down, so it never overlaps the timed rounds): the peak
+bytes allocated by one call, and bytes still held per call afterwards.
+
+`--save` writes the results as JSON; `--compare` reads such a file and
+prints the change per case, exiting non-zero when a case got slower by more
+than `--threshold` percent. Compare runs from the same machine and Python.
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from fastapi_pagination import Page, Params
+from starlette.requests import Request
+
+from .auth.utilits import (
+    create_access_token,
+    hash_password,
+    issue_token,
+    verify_password,
+)
+from .dependencies import verify_access_token
+from .env_loader import settings
+from .limiter import get_smart_key
+from .schemas.course import CreateCourseSchema, ReadCourseSchema
+from .schemas.user import UserCreateSchema
+
+
+class Result(NamedTuple):
+    name: str
+    ops_per_sec: float
+    median_ns: float
+    stdev_pct: float
+    rounds: int
+    loops: int
+    alloc_peak_bytes: int
+    retained_bytes: float
+
+
+def _time_loops(func: Callable[[], Any], loops: int) -> float:
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - started
+
+
+def calibrate_loops(func: Callable[[], Any], min_time: float) -> int:
+    """Smallest power of two of calls that takes at least `min_time` seconds."""
+    loops = 1
+    while _time_loops(func, loops) < min_time and loops < 1 << 24:
+        loops *= 2
+    return loops
+
+
+def allocations(func: Callable[[], Any], loops: int = 100) -> tuple[int, float]:
+    """Peak bytes allocated by one call, and bytes retained per call."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        func()  # first-call caches are not the steady state
+        gc.collect()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        for _ in range(loops - 1):
+            func()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+    return peak - before, (after - before) / loops
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    *,
+    repeat: int = 15,
+    min_time: float = 0.05,
+    warmup: float = 0.1,
+) -> Result:
+    deadline = time.perf_counter() + warmup
+    while True:
+        func()
+        if time.perf_counter() >= deadline:
+            break
+    loops = calibrate_loops(func, min_time)
+
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        per_op = [_time_loops(func, loops) / loops for _ in range(repeat)]
+    finally:
+        if was_enabled:
+            gc.enable()
+
+    median = statistics.median(per_op)
+    stdev = statistics.stdev(per_op) if repeat > 1 else 0.0
+    peak, retained = allocations(func, min(loops, 100))
+    return Result(
+        name=name,
+        ops_per_sec=1 / median,
+        median_ns=median * 1e9,
+        stdev_pct=stdev / median * 100,
+        rounds=repeat,
+        loops=loops,
+        alloc_peak_bytes=peak,
+        retained_bytes=retained,
+    )
+
+
+def _request(user: dict | None) -> Request:
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/courses/",
+            "headers": [(b"host", b"testserver")],
+            "client": ("203.0.113.7", 52000),
+        }
+    )
+    if user is not None:
+        request.state.user = user
+    return request
+
+
+def cases() -> dict[str, Callable[[], Any]]:
+    """Zero-argument callables, with inputs shaped like real requests."""
+    claims = {"sub": "ada@example.com", "id": 42, "role": "teacher"}
+    token = issue_token(claims, timedelta(minutes=settings.access_token_expire_minutes))
+    password = "correct horse battery staple"
+    password_hash = hash_password(password)
+    new_user = {
+        "name": "  Ada Lovelace ",
+        "bio": "Writes the first programs.",
+        "email": "  Ada.Lovelace@Example.COM ",
+        "role": " Teacher ",
+        "password": password,
+    }
+    new_course = {
+        "title": "Analytical Engines 101",
+        "description": "Notes on the engine, with worked examples.",
+        "video_id": "dQw4w9WgXcQ",
+        "category": "programming",
+    }
+    # what the course list pulls from the database for one full page
+    rows = [
+        {
+            "id": i,
+            "title": f"Course {i}",
+            "description": "A description of moderate length. " * 3,
+            "video_id": f"video{i:06d}",
+            "author_id": i % 17,
+            "category_id": i % 5,
+        }
+        for i in range(50)
+    ]
+    params = Params(page=1, size=50)
+    signed_in = _request({"id": 42, "role": "teacher"})
+    anonymous = _request(None)
+
+    return {
+        "create_access_token": lambda: create_access_token(
+            claims, settings.secret_key, settings.algorithm, timedelta(minutes=15)
+        ),
+        "verify_access_token": lambda: verify_access_token(token),
+        "hash_password": lambda: hash_password(password),
+        "verify_password": lambda: verify_password(password, password_hash),
+        "validate_user_create": lambda: UserCreateSchema.model_validate(new_user),
+        "validate_course_create": lambda: CreateCourseSchema.model_validate(new_course),
+        "serialize_course_page": lambda: (
+            Page[ReadCourseSchema].create(rows, params, total=1234).model_dump_json()
+        ),
+        "smart_key_user": lambda: get_smart_key(signed_in),
+        "smart_key_anonymous": lambda: get_smart_key(anonymous),
+    }
+
+
+def compare(
+    results: list[Result], baseline: dict[str, dict], threshold_pct: float
+) -> list[tuple[str, float, bool]]:
+    """(name, % change in ops/sec, regressed) for cases present in both."""
+    changes = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None:
+            continue
+        change = (result.ops_per_sec / before["ops_per_sec"] - 1) * 100
+        changes.append((result.name, change, change < -threshold_pct))
+    return changes
+
+
+def save(path: Path, results: list[Result]) -> None:
+    data = {
+        "python": sys.version.split()[0],
+        "results": {result.name: result._asdict() for result in results},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def load(path: Path) -> dict[str, dict]:
+    return json.loads(path.read_text())["results"]
+
+
+def _format(result: Result) -> str:
+    return (
+        f"{result.name:<24} {result.ops_per_sec:>12,.0f} ops/s"
+        f" {result.median_ns / 1000:>10.2f} us ±{result.stdev_pct:4.1f}%"
+        f" {result.alloc_peak_bytes:>9,} B peak"
+        f" {result.retained_bytes:>8.1f} B kept"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks")
+    parser.add_argument("--filter", default="", help="only cases containing this")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--warmup", type=float, default=0.1)
+    parser.add_argument("--save", type=Path, metavar="JSON")
+    parser.add_argument("--compare", type=Path, metavar="JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="% slowdown that fails"
+    )
+    args = parser.parse_args()
+
+    results = []
+    for name, func in cases().items():
+        if args.filter in name:
+            result = measure(
+                name,
+                func,
+                repeat=args.repeat,
+                min_time=args.min_time,
+                warmup=args.warmup,
+            )
+            results.append(result)
+            print(_format(result))  # noqa: T201
+
+    if args.save:
+        save(args.save, results)
+        print(f"wrote {args.save}")  # noqa: T201
+    if args.compare:
+        changes = compare(results, load(args.compare), args.threshold)
+        for name, change, regressed in changes:
+            mark = "  REGRESSION" if regressed else ""
+            print(f"{name:<24} {change:+7.1f}%{mark}")  # noqa: T201
+        if any(regressed for _, _, regressed in changes):
+            sys.exit(1)
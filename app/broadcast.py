@@ -0,0 +1,270 @@
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from typing import AsyncGenerator, Callable, Protocol
+
+from fastapi import Request
+from sqlalchemy import text
+
+from . import database
+from .env_loader import settings
+
+logger = logging.getLogger(__name__)
+
+Dispatch = Callable[[str, dict], None]
+
+
+class FanoutBackend(Protocol):
+    """Carries published messages to the hub of every worker (ours included)."""
+
+    async def start(self, dispatch: Dispatch) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def publish(self, topic: str, message: dict) -> None: ...
+
+
+class LocalBackend:
+    """Single-process stand-in: messages only reach this worker's hub."""
+
+    def __init__(self) -> None:
+        self._dispatch: Dispatch | None = None
+
+    async def start(self, dispatch: Dispatch) -> None:
+        self._dispatch = dispatch
+
+    async def stop(self) -> None:
+        self._dispatch = None
+
+    async def publish(self, topic: str, message: dict) -> None:
+        if self._dispatch is not None:
+            self._dispatch(topic, message)
+
+
+class PostgresNotifyBackend:
+    """Fan out across workers with PostgreSQL LISTEN/NOTIFY.
+
+    One connection per worker is held out of the pool for LISTEN; NOTIFY is
+    sent on a regular pooled connection. Payloads must stay under 8000 bytes,
+    so publish ids and let subscribers fetch the rest. If the LISTEN
+    connection drops, it is replaced with exponential backoff; messages sent
+    while it was down are lost.
+    """
+
+    max_payload_bytes = 7999
+
+    def __init__(
+        self,
+        channel: str = "e_backend_events",
+        retry_initial: float = 0.5,
+        retry_max: float = 30.0,
+    ) -> None:
+        self.channel = channel
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self._dispatch: Dispatch | None = None
+        self._conn = None
+        self._raw = None
+        self._reconnect: asyncio.Task | None = None
+
+    def _on_notify(self, _conn: object, _pid: int, _channel: str, payload: str) -> None:
+        envelope = json.loads(payload)
+        self._dispatch(envelope["topic"], envelope["message"])
+
+    def _on_terminated(self, _conn: object) -> None:
+        if self._dispatch is not None and self._reconnect is None:
+            self._reconnect = asyncio.create_task(self._relisten())
+
+    async def _listen(self) -> None:
+        self._conn = await database.engine.connect()
+        raw = await self._conn.get_raw_connection()
+        self._raw = raw.driver_connection
+        self._raw.add_termination_listener(self._on_terminated)
+        await self._raw.add_listener(self.channel, self._on_notify)
+
+    async def _discard(self) -> None:
+        conn, self._conn, self._raw = self._conn, None, None
+        if conn is not None:
+            # the driver connection is dead, keep the pool from reusing it
+            with contextlib.suppress(Exception):
+                await conn.invalidate()
+                await conn.close()
+
+    async def _relisten(self) -> None:
+        delay = self.retry_initial
+        try:
+            await self._discard()
+            while True:
+                logger.warning("LISTEN connection lost, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+                try:
+                    await self._listen()
+                except Exception:
+                    await self._discard()
+                    delay = min(delay * 2, self.retry_max)
+                else:
+                    logger.info("LISTEN connection restored")
+                    return
+        finally:
+            self._reconnect = None
+
+    async def start(self, dispatch: Dispatch) -> None:
+        self._dispatch = dispatch
+        await self._listen()
+
+    async def stop(self) -> None:
+        self._dispatch = None
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reconnect
+            self._reconnect = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = self._raw = None
+
+    async def publish(self, topic: str, message: dict) -> None:
+        payload = json.dumps({"topic": topic, "message": message})
+        size = len(payload.encode())
+        if size > self.max_payload_bytes:
+            raise ValueError(f"NOTIFY payload of {size} bytes is too large")
+        async with database.engine.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+            await conn.commit()
+
+
+class Subscription:
+    """A subscriber's bounded buffer; when full, the oldest message is dropped."""
+
+    def __init__(self, topic: str, buffer_size: int) -> None:
+        self.topic = topic
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+    def offer(self, message: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class BroadcastHub:
+    """In-process pub/sub; cross-worker delivery is left to the backend."""
+
+    def __init__(self, backend: FanoutBackend, buffer_size: int = 100) -> None:
+        self.backend = backend
+        self.buffer_size = buffer_size
+        self._subscribers: defaultdict[str, set[Subscription]] = defaultdict(set)
+        self._listeners: defaultdict[str, list[Callable[[dict], None]]] = defaultdict(
+            list
+        )
+        self._started = False
+
+    async def start(self) -> None:
+        await self.backend.start(self.dispatch)
+        self._started = True
+
+    async def stop(self) -> None:
+        self._started = False
+        await self.backend.stop()
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(topic, self.buffer_size)
+        self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def add_listener(self, topic: str, callback: Callable[[dict], None]) -> None:
+        """Call `callback(message)` in-process for every message on `topic`.
+
+        For worker state kept in sync through the hub; unlike subscriptions,
+        listeners are never buffered or dropped.
+        """
+        self._listeners[topic].append(callback)
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
+
+    def dispatch(self, topic: str, message: dict) -> None:
+        for callback in self._listeners.get(topic, ()):
+            callback(message)
+        for subscription in tuple(self._subscribers.get(topic, ())):
+            subscription.offer(message)
+
+    async def publish(self, topic: str, event: str, data: dict) -> bool:
+        """Best effort: failures are logged, never raised.
+
+        Callers publish after their commit, so an error here must not turn a
+        write that succeeded into a 500 (and an idempotent retry into a
+        duplicate). Returns whether the message went out.
+        """
+        message = {"event": event, "data": data}
+        try:
+            if self._started:
+                await self.backend.publish(topic, message)
+            else:
+                # lifespan has not run (tests, scripts): deliver locally
+                self.dispatch(topic, message)
+        except Exception:
+            logger.exception(
+                "broadcast publish failed", extra={"topic": topic, "event": event}
+            )
+            return False
+        return True
+
+    async def sse_stream(
+        self, request: Request, topic: str, heartbeat: float = 15.0
+    ) -> AsyncGenerator[str, None]:
+        """Relay a topic as Server-Sent Events until the client leaves.
+
+        The subscription is made once the body starts, so a client that
+        disconnects before then leaves nothing behind. A comment line is sent
+        every `heartbeat` seconds to keep proxies from closing an idle
+        connection. If the buffer overflowed, a `resync` event tells the
+        client it missed messages and should refetch.
+        """
+        dropped = 0
+        subscription = self.subscribe(topic)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(), heartbeat
+                    )
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscription.dropped != dropped:
+                    yield format_sse(
+                        "resync", {"dropped": subscription.dropped - dropped}
+                    )
+                    dropped = subscription.dropped
+                yield format_sse(message["event"], message["data"])
+        finally:
+            self.unsubscribe(subscription)
+
+
+def make_backend(name: str) -> FanoutBackend:
+    if name == "postgres":
+        return PostgresNotifyBackend()
+    if name == "local":
+        return LocalBackend()
+    raise ValueError(f"Unknown broadcast backend '{name}'")
+
+
+hub = BroadcastHub(make_backend(settings.broadcast_backend))
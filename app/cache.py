@@ -0,0 +1,336 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Protocol
+from urllib.parse import urlsplit
+
+from fastapi import Request, Response, status
+
+from .broadcast import BroadcastHub, LocalBackend, hub
+from .coalesce import SingleFlight, coalesce_key
+from .compression import PrecompressedBody, precompressed_response
+from .env_loader import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_TOPIC = "cache.invalidate"
+
+
+class CacheBackend(Protocol):
+    """Shared (L2) store reachable from every worker."""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def incr(self, key: str) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+class LocalCacheBackend:
+    """In-process stand-in for a Redis server, for tests and single workers."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[float | None, Any]] = {}
+
+    def _live(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> bytes | None:
+        return self._live(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self._data[key] = (None, value)
+        return value
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+class RespError(Exception):
+    """Error reply from the Redis-protocol server."""
+
+
+class RespCacheBackend:
+    """Minimal Redis-protocol (RESP2) client: GET, SET PX, INCR.
+
+    Connections are opened lazily and reused from a small pool; one that
+    fails mid-command is dropped rather than returned.
+    """
+
+    def __init__(self, url: str, pool_size: int = 4) -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self._pool: asyncio.LifoQueue = asyncio.LifoQueue(pool_size)
+        for _ in range(pool_size):
+            self._pool.put_nowait(None)
+
+    @staticmethod
+    def encode(*args: str | bytes) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg.encode() if isinstance(arg, str) else arg
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    @classmethod
+    async def read_reply(cls, reader: asyncio.StreamReader) -> Any:
+        line = (await reader.readline()).rstrip(b"\r\n")
+        if not line:
+            raise ConnectionError("Cache server closed the connection")
+        kind, rest = line[:1], line[1:]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            return (await reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            count = int(rest)
+            if count < 0:
+                return None
+            return [await cls.read_reply(reader) for _ in range(count)]
+        raise ConnectionError(f"Unexpected reply from cache server: {line!r}")
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", str(self.db)))
+        for command in setup:
+            writer.write(self.encode(*command))
+            await writer.drain()
+            await self.read_reply(reader)
+        return reader, writer
+
+    async def command(self, *args: str | bytes) -> Any:
+        conn = await self._pool.get()
+        try:
+            if conn is None:
+                conn = await self._open()
+            reader, writer = conn
+            writer.write(self.encode(*args))
+            await writer.drain()
+            return await self.read_reply(reader)
+        except BaseException as exc:
+            # an error reply leaves the connection usable; anything else doesn't
+            if conn is not None and not isinstance(exc, RespError):
+                conn[1].close()
+                conn = None
+            raise
+        finally:
+            self._pool.put_nowait(conn)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.command("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.command("SET", key, value, "PX", str(max(1, int(ttl * 1000))))
+
+    async def incr(self, key: str) -> int:
+        return await self.command("INCR", key)
+
+    async def close(self) -> None:
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            if conn is not None:
+                conn[1].close()
+
+
+class ResponseCache:
+    """Two-tier cache of serialized response bodies, grouped in namespaces.
+
+    L1 is a per-worker LRU holding `PrecompressedBody`s, so hits skip both
+    the query and recompression. L2, when configured, is shared by all
+    workers. Concurrent misses for a key share one load.
+
+    Invalidation is per namespace: bumping its generation changes every key
+    in it. The new generation is stored in L2 and announced through the
+    broadcast hub so other workers drop their L1 entries at once. With the
+    local hub nothing reaches other workers, so the generation is read from
+    L2 on every lookup instead.
+    """
+
+    def __init__(
+        self,
+        l2: CacheBackend | None,
+        max_entries: int,
+        ttls: dict[str, float],
+        default_ttl: float,
+        prefix: str = "",
+        l2_timeout: float = 0.1,
+        broadcast: BroadcastHub = hub,
+    ) -> None:
+        self.l2 = l2
+        self.broadcast = broadcast
+        self.l2_timeout = l2_timeout
+        self.max_entries = max_entries
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self._l1: OrderedDict[str, tuple[float, PrecompressedBody]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._flight = SingleFlight()
+        self._poll_generations = l2 is not None and isinstance(
+            broadcast.backend, LocalBackend
+        )
+
+    def __len__(self) -> int:
+        return len(self._l1)
+
+    def clear(self) -> None:
+        self._l1.clear()
+        self._generations.clear()
+
+    def ttl(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}gen:{namespace}"
+
+    async def _generation(self, namespace: str) -> int:
+        known = self._generations.get(namespace)
+        if known is None or self._poll_generations:
+            stored = await self._l2_call("get", self._generation_key(namespace))
+            if known is None:
+                self._generations.setdefault(namespace, int(stored) if stored else 0)
+            elif stored and int(stored) > known:
+                self._apply_generation(namespace, int(stored))
+        return self._generations[namespace]
+
+    async def _l2_call(self, method: str, *args: Any) -> Any:
+        # the shared tier is an optimization: when it is down, serve without it
+        if self.l2 is None:
+            return None
+        try:
+            async with asyncio.timeout(self.l2_timeout):
+                return await getattr(self.l2, method)(*args)
+        except (OSError, EOFError, RespError):
+            logger.warning("L2 cache %s failed", method, exc_info=True)
+            return None
+
+    def _l1_get(self, key: str) -> PrecompressedBody | None:
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at <= time.monotonic():
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return body
+
+    def _l1_set(self, key: str, body: PrecompressedBody, ttl: float) -> None:
+        self._l1[key] = (time.monotonic() + ttl, body)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+
+    async def get_or_load(
+        self, namespace: str, key: str, load: Callable[[], Awaitable[bytes]]
+    ) -> PrecompressedBody:
+        generation = await self._generation(namespace)
+        full_key = f"{self.prefix}{namespace}:{generation}:{key}"
+        body = self._l1_get(full_key)
+        if body is not None:
+            return body
+
+        async def fill() -> PrecompressedBody:
+            ttl = self.ttl(namespace)
+            raw = await self._l2_call("get", full_key)
+            if raw is None:
+                raw = await load()
+                await self._l2_call("set", full_key, raw, ttl)
+            body = PrecompressedBody(raw)
+            self._l1_set(full_key, body, ttl)
+            return body
+
+        return await self._flight.do(full_key, fill)
+
+    def _apply_generation(self, namespace: str, generation: int) -> None:
+        if generation > self._generations.get(namespace, -1):
+            self._generations[namespace] = generation
+        marker = f"{self.prefix}{namespace}:"
+        for key in [k for k in self._l1 if k.startswith(marker)]:
+            del self._l1[key]
+
+    async def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            generation = await self._l2_call("incr", self._generation_key(namespace))
+            if generation is None:
+                generation = await self._generation(namespace) + 1
+            self._apply_generation(namespace, generation)
+            await self.broadcast.publish(
+                CACHE_TOPIC,
+                "invalidate",
+                {"namespace": namespace, "generation": generation},
+            )
+
+    def on_message(self, message: dict) -> None:
+        data = message["data"]
+        self._apply_generation(data["namespace"], data["generation"])
+
+    async def close(self) -> None:
+        if self.l2 is not None:
+            await self.l2.close()
+
+
+def make_l2(url: str | None) -> CacheBackend | None:
+    if not url:
+        return None
+    if url == "local":
+        return LocalCacheBackend()
+    if url.startswith(("redis://", "resp://")):
+        return RespCacheBackend(url)
+    raise ValueError(f"Unknown cache backend '{url}'")
+
+
+response_cache = ResponseCache(
+    make_l2(settings.cache_l2_url),
+    max_entries=settings.cache_l1_max_entries,
+    ttls=settings.cache_ttl_seconds,
+    default_ttl=settings.cache_default_ttl_seconds,
+    prefix=settings.cache_key_prefix,
+    l2_timeout=settings.cache_l2_timeout_seconds,
+)
+hub.add_listener(CACHE_TOPIC, response_cache.on_message)
+
+
+def request_cache_key(request: Request) -> str:
+    """Short, stable key for a read: method, path, query and user role."""
+    return hashlib.sha1(repr(coalesce_key(request)).encode()).hexdigest()
+
+
+async def cached_response(
+    request: Request,
+    namespace: str,
+    load: Callable[[], Awaitable[bytes]],
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """Serve `load()`'s serialized JSON body through the response cache."""
+    body = await response_cache.get_or_load(namespace, request_cache_key(request), load)
+    return precompressed_response(request, body, status_code=status_code)
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from fastapi import Request
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller (the leader) runs the call; callers arriving while it is
+    still running await the leader's result instead of running it again.
+    Nothing is cached: once the call settles the key is forgotten.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while (call := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                # the leader was cancelled (client went away), not us: take over
+                task = asyncio.current_task()
+                if call.cancelled() and task is not None and not task.cancelling():
+                    continue
+                raise
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            call.exception()  # mark as retrieved when nobody was waiting
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+def coalesce_key(request: Request) -> tuple:
+    """Identify identical reads: same method, path, query and user role."""
+    user: dict | None = getattr(request.state, "user", None)
+    return (
+        request.method,
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        user.get("role") if user else None,
+    )
@@ -0,0 +1,207 @@
+import gzip
+import zlib
+
+from fastapi import Request, Response, status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .env_loader import settings
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip only
+    zstandard = None
+
+# server preference, best first
+ENCODINGS: tuple[str, ...] = ("zstd", "gzip") if zstandard else ("gzip",)
+
+
+def _zstd_compressor() -> "zstandard.ZstdCompressor":
+    # a ZstdCompressor holds one compression context, so calls overlapping on
+    # a shared one corrupt each other's frames: make one per body or stream
+    return zstandard.ZstdCompressor(level=settings.compression_zstd_level)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Pick the encoding to use for an `Accept-Encoding` header, if any."""
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd" and zstandard is not None:
+        return _zstd_compressor().compress(data)
+    return gzip.compress(data, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes every chunk, so streams stay live."""
+
+    def __init__(self, encoding: str) -> None:
+        if encoding == "zstd" and zstandard is not None:
+            self._obj = _zstd_compressor().compressobj()
+            self._sync = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            # wbits=31: deflate with a gzip header and trailer
+            self._obj = zlib.compressobj(
+                settings.compression_gzip_level, zlib.DEFLATED, 31
+            )
+            self._sync = zlib.Z_SYNC_FLUSH
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        data = self._obj.compress(chunk)
+        return data + (self._obj.flush() if final else self._obj.flush(self._sync))
+
+
+class PrecompressedBody:
+    """Serialized body plus its compressed variants, each made on first use.
+
+    Share one instance between every response for the same data (coalesced
+    or cached reads) and each encoding is compressed once, not per request.
+    """
+
+    __slots__ = ("raw", "_variants")
+
+    def __init__(self, raw: bytes) -> None:
+        self.raw = raw
+        self._variants: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = self._variants[encoding] = compress(self.raw, encoding)
+        return variant
+
+
+def precompressed_response(
+    request: Request,
+    body: PrecompressedBody,
+    status_code: int = status.HTTP_200_OK,
+    media_type: str = "application/json",
+) -> Response:
+    headers = {"Vary": "Accept-Encoding"}
+    content = body.raw
+    if len(body.raw) >= settings.compression_minimum_size:
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+        if encoding is not None:
+            content = body.encoded(encoding)
+            headers["Content-Encoding"] = encoding
+    return Response(
+        content=content,
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding the client accepts.
+
+    Bodies under `minimum_size`, responses that are already encoded (e.g. from
+    `precompressed_response`) and excluded media types such as Server-Sent
+    Events pass through untouched. Streaming bodies are compressed chunk by
+    chunk and flushed each time, so nothing is held back.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 500,
+        excluded_media_types: tuple[str, ...] = ("text/event-stream",),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.excluded_media_types = frozenset(excluded_media_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+
+class _CompressingSend:
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.passthrough = False
+        self.compressor: _StreamCompressor | None = None
+
+    def eligible(self, headers: MutableHeaders) -> bool:
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        length = headers.get("content-length")
+        return (
+            "content-encoding" not in headers
+            and media_type not in self.middleware.excluded_media_types
+            and (length is None or int(length) >= self.middleware.minimum_size)
+        )
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            if self.eligible(MutableHeaders(scope=message)):
+                # held back until the first body chunk shows the size
+                self.start = message
+            else:
+                self.passthrough = True
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            del headers["Content-Length"]
+            self.compressor = _StreamCompressor(self.encoding)
+            await self.send(start)
+
+        assert self.compressor is not None
+        await self.send(
+            {
+                "type": "http.response.body",
+                "body": self.compressor.compress(body, final=not more_body),
+                "more_body": more_body,
+            }
+        )
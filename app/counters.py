@@ -0,0 +1,67 @@
+from collections import defaultdict
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from .database import AsyncSessionLocal
+from .models.courses import Course
+
+
+class BatchedCounter:
+    """Per-worker counter deltas, flushed as one batch of increments.
+
+    Instead of an UPDATE (and a row lock) per event, deltas accumulate in
+    memory and each flush issues a single executemany of
+    `column = column + :delta`, one row per key, in key order so concurrent
+    workers lock rows in the same order.
+    """
+
+    def __init__(self, column: InstrumentedAttribute[int]) -> None:
+        table = column.class_.__table__
+        self.column = table.c[column.key]
+        self.statement = (
+            update(table)
+            .where(table.c.id == bindparam("_key"))
+            .values({self.column: self.column + bindparam("_delta")})
+        )
+        self._deltas: defaultdict[int, int] = defaultdict(int)
+
+    def add(self, key: int, delta: int = 1) -> None:
+        self._deltas[key] += delta
+
+    def clear(self) -> None:
+        self._deltas.clear()
+
+    def pending(self, key: int) -> int:
+        """Delta not yet written to the database for `key`."""
+        return self._deltas.get(key, 0)
+
+    async def flush(self, db: AsyncSession) -> int:
+        deltas, self._deltas = self._deltas, defaultdict(int)
+        rows = [
+            {"_key": key, "_delta": delta}
+            for key, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return 0
+        try:
+            await db.execute(self.statement, rows)
+            await db.commit()
+        except Exception:
+            # keep the deltas for the next flush
+            for key, delta in deltas.items():
+                self._deltas[key] += delta
+            raise
+        return len(rows)
+
+
+enrollment_counter = BatchedCounter(Course.enrollment_count)
+view_counter = BatchedCounter(Course.view_count)
+
+
+async def flush_counters() -> None:
+    async with AsyncSessionLocal() as db:
+        await enrollment_counter.flush(db)
+        await view_counter.flush(db)
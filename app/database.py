@@ -1,22 +1,167 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from fastapi import Request
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
 
+from .deadline import (
+    apply_connection_timeout,
+    apply_statement_timeout,
+    route_deadline,
+)
 from .env_loader import settings
 
-engine = create_async_engine(settings.postgresql_url)
+
+def is_sqlite_file(url: str) -> bool:
+    """True for an on-disk SQLite database, the only kind the profile suits."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return False
+    database = parsed.database or ""
+    return database not in ("", ":memory:") and parsed.query.get("mode") != "memory"
+
+
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        # with WAL, NORMAL only risks the last commits on power loss, never corruption
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        # negative: size in KiB rather than pages
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA foreign_keys=ON",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _install_sqlite_profile(engine: AsyncEngine, read_only: bool) -> None:
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection: Any, _record: Any) -> None:
+        # let SQLAlchemy's "begin" event below issue BEGIN, not the driver
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def begin(conn: Any) -> None:
+        # the writer takes the write lock up front, so a transaction that read
+        # first can't fail upgrading it; busy_timeout covers waiting for it
+        conn.exec_driver_sql("BEGIN" if read_only else "BEGIN IMMEDIATE")
+
+
+sqlite_profile = is_sqlite_file(settings.postgresql_url)
+
+# Single-node SQLite: one writer connection per process (SQLite allows one
+# writer anyway, so more would only queue on its lock) and a pool of
+# read-only connections that, under WAL, never wait for it.
+if sqlite_profile:
+    engine = create_async_engine(settings.postgresql_url, pool_size=1, max_overflow=0)
+    _install_sqlite_profile(engine, read_only=False)
+    read_engine: AsyncEngine | None = create_async_engine(
+        settings.postgresql_url,
+        pool_size=settings.sqlite_reader_pool_size,
+        max_overflow=0,
+    )
+    _install_sqlite_profile(read_engine, read_only=True)
+else:
+    engine = create_async_engine(settings.postgresql_url)
+    read_engine = None
+
+
+def reader() -> AsyncEngine:
+    """Engine for read-only work: the reader pool when there is one."""
+    return read_engine if read_engine is not None else engine
 
 
 class Base(DeclarativeBase):
     pass
 
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False
-)
+class RoutingSession(Session):
+    """Sends SELECTs to the reader pool and writes to the writer.
 
+    Once a transaction has flushed it stays on the writer, so it reads its own
+    uncommitted changes.
+    """
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        if self.info.get("wrote") or self._flushing or not _is_select(clause):
+            self.info["wrote"] = True
+            return engine.sync_engine
+        return reader().sync_engine
+
+
+def _is_select(clause: Any) -> bool:
+    return (
+        bool(getattr(clause, "is_select", False))
+        and getattr(clause, "_for_update_arg", None) is None
+    )
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _forget_writes(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.info.pop("wrote", None)
+
+
+if sqlite_profile:
+    AsyncSessionLocal = async_sessionmaker(
+        class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+    )
+else:
+    AsyncSessionLocal = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+async def dispose_engines(close: bool = True) -> None:
+    await engine.dispose(close=close)
+    if read_engine is not None:
+        await read_engine.dispose(close=close)
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
+        seconds = route_deadline(request)
+        if seconds is not None:
+            apply_statement_timeout(session, seconds)
         yield session
+
+
+@asynccontextmanager
+async def read_connection(request: Request) -> AsyncIterator[AsyncConnection]:
+    """Plain connection for read-only endpoints.
+
+    Use it with column selects from `app.readpath`: rows come back as
+    tuples, skipping the session's identity map and attribute instrumentation.
+    Cached endpoints open it inside their loader, so cache hits never take a
+    connection from the pool.
+    """
+    async with reader().connect() as conn:
+        seconds = route_deadline(request)
+        if seconds is not None:
+            await apply_connection_timeout(conn, seconds)
+        yield conn
+
+
+async def get_read_conn(request: Request) -> AsyncGenerator[AsyncConnection, None]:
+    """`read_connection` as a dependency, for reads that aren't cached."""
+    async with read_connection(request) as conn:
+        yield conn
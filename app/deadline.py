@@ -0,0 +1,90 @@
+import asyncio
+import functools
+from typing import Any, Callable, TypeVar
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# PostgreSQL "query_canceled", raised when statement_timeout fires
+QUERY_CANCELED = "57014"
+
+
+def deadline(seconds: float) -> Callable[[F], F]:
+    """Give an endpoint a time budget, declared next to its `@limiter.limit`.
+
+    The whole handler runs under `asyncio.timeout`; `get_db` reads the same
+    budget and sets `statement_timeout` so PostgreSQL cancels the query on its
+    side too. Either way the client gets a 504.
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                async with asyncio.timeout(seconds):
+                    return await func(*args, **kwargs)
+            except TimeoutError:
+                raise deadline_exceeded() from None
+            except DBAPIError as exc:
+                if is_statement_timeout(exc):
+                    raise deadline_exceeded() from exc
+                raise
+
+        # functools.wraps copies __dict__, so outer decorators keep this too
+        wrapper.deadline_seconds = seconds  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def deadline_exceeded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        detail="Request deadline exceeded",
+    )
+
+
+def is_statement_timeout(exc: DBAPIError) -> bool:
+    orig = exc.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code == QUERY_CANCELED
+
+
+def route_deadline(request: Request) -> float | None:
+    """Deadline declared on the endpoint matched for this request, if any."""
+    endpoint = request.scope.get("endpoint")
+    return getattr(endpoint, "deadline_seconds", None)
+
+
+def apply_statement_timeout(session: AsyncSession, seconds: float) -> None:
+    """Set `statement_timeout` on every transaction the session begins.
+
+    `SET LOCAL` lasts only until the transaction ends, so the pooled
+    connection goes back to the pool without the setting.
+    """
+    timeout_ms = int(seconds * 1000)
+
+    @event.listens_for(session.sync_session, "after_begin")
+    def set_statement_timeout(
+        _session: Session, _transaction: SessionTransaction, connection: Connection
+    ) -> None:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+async def apply_connection_timeout(conn: AsyncConnection, seconds: float) -> None:
+    """`apply_statement_timeout` for a bare connection from `read_connection`.
+
+    The connection autobegins here, and `SET LOCAL` ends with that
+    transaction when the connection goes back to the pool.
+    """
+    if conn.dialect.name == "postgresql":
+        await conn.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {int(seconds * 1000)}"
+        )
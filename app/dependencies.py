@@ -1,23 +1,20 @@
 from typing import Annotated
 
-import jwt
 from fastapi import Depends, HTTPException, Request, status
 from jwt.exceptions import (
     ExpiredSignatureError,
     InvalidSignatureError,
     InvalidTokenError,
 )
-from pydantic import SecretStr
 
-from .env_loader import settings
+from .auth.keys import keyring
+from .revocation import revocation_list, user_key
 
 
-def verify_access_token(
-    token: str, secret_key: SecretStr, algorithms: list[str]
-) -> dict | None:
+def verify_access_token(token: str) -> dict | None:
     """Verify a JWT access token and return the payload if valid."""
     try:
-        return jwt.decode(token, secret_key.get_secret_value(), algorithms=algorithms)
+        return keyring.decode(token)
     except ExpiredSignatureError:
         return None
     except InvalidSignatureError:
@@ -26,9 +23,7 @@ def verify_access_token(
         return None
 
 
-def get_current_user(
-    request: Request, secret_key: SecretStr, algorithms: list[str]
-) -> dict | None:
+def get_current_user(request: Request) -> dict | None:
     """Get the current user from the JWT token."""
     try:
         token = request.cookies.get("access_token")
@@ -36,15 +31,28 @@ def get_current_user(
         return None
     if not token:
         return None
-    payload = verify_access_token(token, secret_key, algorithms)
+    payload = verify_access_token(token)
     if payload is None:
         return None
     return payload
 
 
+def request_actor(request: Request) -> str | None:
+    """Id of the authenticated user making the request, if any."""
+    user = getattr(request.state, "user", None)
+    return user.get("id") if isinstance(user, dict) else None
+
+
 async def current_user_dependency(request: Request) -> dict | None:
-    user = get_current_user(request, settings.secret_key, [settings.algorithm])
-    if user is None:
+    user = get_current_user(request)
+    if (
+        user is None
+        # refresh tokens are only good for /auth/refresh
+        or user.get("type") == "refresh"
+        or ("jti" in user and await revocation_list.is_revoked(user["jti"]))
+        # a deleted user's tokens outlive the account until they expire
+        or await revocation_list.is_revoked(user_key(user.get("id")))
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -9,6 +9,112 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int
     admin_email: str
 
+    # adaptive admission control (per worker)
+    admission_initial_limit: int = 64
+    admission_min_limit: int = 8
+    admission_max_limit: int = 512
+    admission_latency_target_ms: int = 250
+    admission_retry_after_seconds: int = 1
+
+    # cross-worker event fan-out: "local" (single process) or "postgres"
+    broadcast_backend: str = "local"
+
+    # write-behind buffers
+    counter_flush_seconds: float = 5.0
+    progress_flush_seconds: float = 10.0
+
+    # popular courses leaderboard
+    leaderboard_size: int = 10
+    leaderboard_refresh_seconds: float = 60.0
+
+    # admin analytics snapshot
+    stats_refresh_seconds: float = 300.0
+
+    # write-behind audit log
+    audit_queue_size: int = 10_000
+    audit_batch_size: int = 500
+    audit_flush_seconds: float = 1.0
+
+    # Idempotency-Key replay store (per worker)
+    idempotency_max_entries: int = 10_000
+    idempotency_ttl_seconds: float = 24 * 60 * 60
+
+    # refresh tokens and the in-memory revocation filter
+    refresh_token_expire_days: int = 14
+    # auth cookies are HTTPS-only unless turned off for local HTTP development
+    cookie_secure: bool = True
+    revocation_filter_capacity: int = 100_000
+    revocation_filter_error_rate: float = 0.001
+    revocation_rebuild_seconds: float = 300.0
+
+    # asymmetric JWT signing; unset keeps HS256 with secret_key
+    jwt_keys_dir: str | None = None
+    jwt_active_kid: str | None = None  # default: newest kid in the directory
+    jwt_accept_shared_secret: bool = True  # still accept tokens without a kid
+    jwks_max_age_seconds: int = 3600
+
+    # response compression (zstd needs the optional zstandard package)
+    compression_minimum_size: int = 500
+    compression_gzip_level: int = 6
+    compression_zstd_level: int = 3
+
+    # two-tier response cache; L2 is a Redis-protocol server (redis://host:6379/0)
+    # or "local" for the in-process stand-in
+    cache_l1_max_entries: int = 1_000
+    cache_l2_url: str | None = None
+    cache_l2_timeout_seconds: float = 0.1
+    cache_key_prefix: str = "e-backend:"
+    cache_default_ttl_seconds: float = 60.0
+    cache_ttl_seconds: dict[str, float] = {"courses": 30.0, "categories": 300.0}
+
+    # single-node SQLite profile, used for on-disk sqlite+aiosqlite URLs: one
+    # writer connection per worker plus this many read-only connections
+    sqlite_reader_pool_size: int = 4
+    sqlite_busy_timeout_ms: int = 5_000
+    sqlite_cache_size_kib: int = 64_000
+    sqlite_mmap_size_bytes: int = 256 * 1024 * 1024
+
+    # online migrations (app/online_migrations.py)
+    migration_lock_timeout_ms: int = 5_000
+    migration_backfill_batch_size: int = 1_000
+    migration_backfill_pause_seconds: float = 0.1
+
+    # on-demand profiling endpoints under /admin/profile (404 while disabled)
+    profiling_enabled: bool = False
+    profiling_max_seconds: float = 60.0
+    profiling_interval_ms: float = 5.0
+    profiling_tracemalloc_frames: int = 1
+
+    # JSON logs on stdout, written from a background thread; successful
+    # GET/HEAD requests can be sampled, slower ones are always logged
+    log_level: str = "INFO"
+    log_queue_size: int = 10_000
+    access_log_enabled: bool = True
+    access_log_sample_rate: float = 1.0
+    access_log_slow_ms: float = 1_000.0
+
+    # warm-up run by each worker before /ready reports ready
+    warmup_connections: int = 5
+    warmup_paths: list[str] = ["/categories/", "/courses/"]
+    warmup_roles: list[str] = ["student", "teacher", "admin"]
+    warmup_timeout_seconds: float = 30.0
+
+    # soft-deleted courses/users are hard-deleted after the retention period,
+    # in throttled batches, only between these hours (UTC; may wrap midnight)
+    purge_retention_hours: float = 24.0
+    purge_window_start_hour: int = 2
+    purge_window_end_hour: int = 5
+    purge_interval_seconds: float = 600.0
+    purge_batch_size: int = 500
+    purge_pause_seconds: float = 0.5
+    purge_max_batches: int = 20
+
+    # Argon2id password hashing cost (pwdlib's defaults); retune per host with
+    # `python -m app.auth.calibrate --write`, logins rehash old hashes
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65_536
+    argon2_parallelism: int = 4
+
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=False,
@@ -0,0 +1,127 @@
+import asyncio
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple, TypeVar
+
+from fastapi import HTTPException, Request, status
+
+from .dependencies import request_actor
+from .env_loader import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# resolved into a waiter's future when the original request failed
+_FAILED = object()
+
+
+class _Entry(NamedTuple):
+    fingerprint: str
+    result: asyncio.Future
+    expires_at: float
+
+
+class IdempotencyStore:
+    """First result per idempotency key, bounded in size and evicted by TTL.
+
+    While the original request is still running, retries with the same key
+    wait for it instead of racing it. A failed original is forgotten so the
+    next retry runs for real. The store is per worker.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        # entries are kept in insertion order, so expired ones are at the front
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry.expires_at > now:
+                break
+            self._entries.popitem(last=False)
+        # past the bound, drop the oldest finished entries; a request still in
+        # flight keeps its key, so the store runs over until it finishes
+        excess = len(self._entries) - self.max_entries + 1
+        if excess > 0:
+            finished = (
+                key for key, entry in self._entries.items() if entry.result.done()
+            )
+            for key in list(islice(finished, excess)):
+                del self._entries[key]
+
+    async def run(
+        self, key: Hashable, fingerprint: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        while True:
+            self._evict()
+            entry = self._entries.get(key)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail={
+                        "error": "Idempotency-Key was already used "
+                        "with a different request body."
+                    },
+                )
+            result = await asyncio.shield(entry.result)
+            if result is not _FAILED:
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = _Entry(fingerprint, future, time.monotonic() + self.ttl)
+        try:
+            result = await fn()
+        except BaseException:
+            entry = self._entries.get(key)
+            if entry is not None and entry.result is future:
+                del self._entries[key]
+            future.set_result(_FAILED)
+            raise
+        future.set_result(result)
+        return result
+
+
+idempotency_store = IdempotencyStore(
+    max_entries=settings.idempotency_max_entries,
+    ttl=settings.idempotency_ttl_seconds,
+)
+
+
+def idempotent(func: F) -> F:
+    """Replay the first response for retries carrying the same Idempotency-Key.
+
+    Keys are scoped to the calling user and route. The endpoint's return
+    value is kept and serialized again for each replay.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        request: Request = kwargs["request"]
+        idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            return await func(*args, **kwargs)
+
+        key = (
+            request_actor(request),
+            request.method,
+            request.url.path,
+            idempotency_key,
+        )
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+        return await idempotency_store.run(
+            key, fingerprint, lambda: func(*args, **kwargs)
+        )
+
+    return wrapper  # type: ignore[return-value]
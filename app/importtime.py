@@ -0,0 +1,75 @@
+"""Import-time report, to keep worker cold start in check.
+
+    python -m app.importtime [--top 15] [--budget-ms 2000]
+
+Imports the app in a fresh interpreter under `python -X importtime` and
+lists the slowest modules by cumulative time. With `--budget-ms` it exits
+non-zero when the whole import is over budget, so CI can track it.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import NamedTuple
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except (IndexError, ValueError):
+            continue  # the header line
+        timings.append(ImportTiming(fields[2].strip(), self_us, cumulative_us))
+    return timings
+
+
+def measure(module: str = "app.main") -> list[ImportTiming]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        errors = [
+            line
+            for line in result.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        raise RuntimeError(f"import {module} failed:\n" + "\n".join(errors[-5:]))
+    return parse_importtime(result.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.importtime")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float)
+    args = parser.parse_args(argv)
+
+    timings = measure(args.module)
+    slowest = sorted(timings, key=lambda t: t.cumulative_us, reverse=True)
+    lines = [f"{'cumulative ms':>14} {'self ms':>9}  module"]
+    lines += [
+        f"{t.cumulative_us / 1000:14.1f} {t.self_us / 1000:9.1f}  {t.module}"
+        for t in slowest[: args.top]
+    ]
+    total_ms = next(t for t in timings if t.module == args.module).cumulative_us / 1000
+    over_budget = args.budget_ms is not None and total_ms > args.budget_ms
+    if over_budget:
+        lines.append(f"over budget: {total_ms:.0f} ms > {args.budget_ms:.0f} ms")
+    sys.stdout.write("\n".join(lines) + "\n")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import heapq
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .env_loader import settings
+from .models.courses import Course
+
+
+class Leaderboard:
+    """Precomputed top-N courses by views, per category and overall.
+
+    Refreshed in the background from the flushed `view_count` column with one
+    windowed query; requests only read the in-memory snapshot.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.generated_at: datetime | None = None
+        self._by_category: dict[int, list[dict]] = {}
+        self._overall: list[dict] = []
+
+    def top(self, category_id: int | None = None) -> list[dict]:
+        if category_id is None:
+            return self._overall
+        return self._by_category.get(category_id, [])
+
+    async def refresh(self, db: AsyncSession) -> None:
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=Course.category_id,
+                order_by=(Course.view_count.desc(), Course.id),
+            )
+            .label("rank")
+        )
+        ranked = select(
+            Course.id, Course.title, Course.category_id, Course.view_count, rank
+        ).subquery()
+        query = (
+            select(
+                ranked.c.id, ranked.c.title, ranked.c.category_id, ranked.c.view_count
+            )
+            .where(ranked.c.rank <= self.size)
+            .order_by(ranked.c.category_id, ranked.c.rank)
+        )
+        rows = (await db.execute(query)).mappings().all()
+
+        by_category: dict[int, list[dict]] = {}
+        for row in rows:
+            by_category.setdefault(row["category_id"], []).append(dict(row))
+        # the overall top N is always within the union of per-category top Ns
+        overall = heapq.nsmallest(
+            self.size, map(dict, rows), key=lambda c: (-c["view_count"], c["id"])
+        )
+
+        # swap in the new snapshot in one step; readers never see a mix
+        self._by_category, self._overall = by_category, overall
+        self.generated_at = datetime.now(UTC)
+
+
+leaderboard = Leaderboard(settings.leaderboard_size)
+
+
+async def refresh_leaderboard() -> None:
+    async with AsyncSessionLocal() as db:
+        await leaderboard.refresh(db)
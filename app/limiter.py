@@ -22,7 +22,7 @@ async def custom_rate_limit_handler(
 def get_smart_key(request: Request) -> str:
     user: dict | None = getattr(request.state, "user", None)
     if user:
-        return f"user_{user.get(id)}"
+        return f"user_{user.get('id')}"
 
     return get_remote_address(request)
 
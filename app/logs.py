@@ -0,0 +1,235 @@
+"""Structured logging that never makes a request wait on I/O.
+
+Every record goes through a `QueueHandler` onto a bounded in-memory queue;
+a `QueueListener` thread formats it as one JSON line and writes it out. The
+event loop only pays for building the record and a `put_nowait`; when the
+writer falls behind, records are dropped and counted rather than queued
+without bound.
+
+`AccessLogMiddleware` logs one line per request with the matched route,
+status, latency, user id and time spent in the database. Successful reads
+can be sampled (`access_log_sample_rate`) since they are the bulk of the
+volume; errors, writes and slow requests are always logged.
+"""
+
+import contextvars
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .env_loader import settings
+
+access_logger = logging.getLogger("app.access")
+
+# attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = frozenset(
+    logging.makeLogRecord({}).__dict__.keys() | {"message", "asctime", "taskName"}
+)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the queue stays in-process, so only resolve the message now (its
+        # args may change later); formatting happens on the writer thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogWriter:
+    """Routes the root logger through the queue to a writer thread.
+
+    `install` can run before the fork (it starts no thread); each worker
+    calls `start` from its lifespan and `stop` on shutdown, which writes out
+    whatever is still queued.
+    """
+
+    def __init__(self, max_queue: int, stream: Any = None) -> None:
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.handler = _DroppingQueueHandler(self.queue)
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+        self.listener = QueueListener(self.queue, output)
+        self._running = False
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def install(self, level: str) -> None:
+        root = logging.getLogger()
+        root.setLevel(level.upper())
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        # uvicorn brings its own (synchronous) handlers; send its records
+        # through ours, and drop its access log in favour of AccessLogMiddleware
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            logger = logging.getLogger(name)
+            logger.handlers.clear()
+            logger.propagate = True
+        logging.getLogger("uvicorn.access").disabled = settings.access_log_enabled
+
+    def start(self) -> None:
+        if not self._running:
+            self.listener.start()
+            self._running = True
+
+    def stop(self) -> None:
+        if self._running:
+            self.listener.stop()
+            self._running = False
+
+
+log_writer = LogWriter(settings.log_queue_size)
+
+
+class RequestTimings:
+    __slots__ = ("db_seconds", "db_queries")
+
+    def __init__(self) -> None:
+        self.db_seconds = 0.0
+        self.db_queries = 0
+
+
+# set per request by AccessLogMiddleware; a mutable holder so time spent in
+# tasks that copied the context (BaseHTTPMiddleware) is still counted
+_timings: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn: Any, cursor: Any, statement: Any, *args: Any) -> None:
+    if _timings.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn: Any, cursor: Any, statement: Any, *args: Any) -> None:
+    timings = _timings.get()
+    started = conn.info.get("query_started")
+    if timings is not None and started:
+        timings.db_seconds += time.perf_counter() - started.pop()
+        timings.db_queries += 1
+
+
+def _user_id(user: Any) -> Any:
+    # token payload from current_user_dependency, or the User model at login
+    if isinstance(user, dict):
+        return user.get("id")
+    return getattr(user, "id", None)
+
+
+class AccessLogMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        sample_rate: float = 1.0,
+        slow_ms: float = 1_000.0,
+        logger: logging.Logger = access_logger,
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.logger = logger
+
+    def sampled_out(self, method: str, status: int, latency_ms: float) -> bool:
+        return (
+            self.sample_rate < 1.0
+            and method in ("GET", "HEAD")
+            and status < 400
+            and latency_ms < self.slow_ms
+            and random.random() >= self.sample_rate
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _timings.reset(token)
+            latency_ms = (time.perf_counter() - started) * 1000
+            method = scope["method"]
+            if not self.sampled_out(method, status, latency_ms):
+                self.log(scope, method, status, latency_ms, timings)
+
+    def log(
+        self,
+        scope: Scope,
+        method: str,
+        status: int,
+        latency_ms: float,
+        timings: RequestTimings,
+    ) -> None:
+        route = scope.get("route")
+        user = scope.get("state", {}).get("user")
+        self.logger.info(
+            "%s %s %d",
+            method,
+            scope["path"],
+            status,
+            extra={
+                "method": method,
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status,
+                "latency_ms": round(latency_ms, 2),
+                "db_ms": round(timings.db_seconds * 1000, 2),
+                "db_queries": timings.db_queries,
+                "user_id": _user_id(user),
+                "sample_rate": self.sample_rate,
+            },
+        )
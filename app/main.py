@@ -1,3 +1,6 @@
+import logging
+import os
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -7,39 +10,148 @@ from fastapi_pagination import add_pagination
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
+from .admission import AdmissionControlMiddleware
+from .audit import audit_log
 from .auth import auth
-from .database import engine
+from .background import PeriodicTask
+from .broadcast import hub
+from .cache import response_cache
+from .compression import CompressionMiddleware
+from .counters import flush_counters
+from .database import dispose_engines
+from .env_loader import settings
+from .leaderboard import refresh_leaderboard
 from .limiter import custom_rate_limit_handler, limiter
-from .routers import category, course, users
+from .logs import AccessLogMiddleware, log_writer
+from .progress import flush_progress
+from .purge import purge_deleted
+from .revocation import rebuild_revocations
+from .routers import (
+    admin,
+    category,
+    course,
+    enrollment,
+    health,
+    jwks,
+    progress,
+    users,
+)
+from .stats import refresh_stats
+from .warmup import warm_up
+
+counter_flusher = PeriodicTask(
+    "counter-flush", flush_counters, settings.counter_flush_seconds
+)
+progress_flusher = PeriodicTask(
+    "progress-flush", flush_progress, settings.progress_flush_seconds
+)
+leaderboard_refresher = PeriodicTask(
+    "leaderboard-refresh",
+    refresh_leaderboard,
+    settings.leaderboard_refresh_seconds,
+    run_at_start=True,
+)
+stats_refresher = PeriodicTask(
+    "stats-refresh", refresh_stats, settings.stats_refresh_seconds, run_at_start=True
+)
+revocation_rebuilder = PeriodicTask(
+    "revocation-rebuild",
+    rebuild_revocations,
+    settings.revocation_rebuild_seconds,
+    run_at_start=True,
+)
+purger = PeriodicTask("purge", purge_deleted, settings.purge_interval_seconds)
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator:
+async def lifespan(app: FastAPI) -> AsyncGenerator:
+    started = time.perf_counter()
+    log_writer.install(settings.log_level)
+    log_writer.start()
+    # with `gunicorn --preload` this module was imported before the fork:
+    # drop any pooled connections inherited from the parent without closing
+    # them, so this worker opens its own
+    await dispose_engines(close=False)
+    await hub.start()
+    revocation_rebuilder.start()
+    counter_flusher.start()
+    progress_flusher.start()
+    leaderboard_refresher.start()
+    stats_refresher.start()
+    audit_log.writer.start()
+    purger.start()
+    warm_up.start(app)
+    logger.info(
+        "worker %d started in %.3fs", os.getpid(), time.perf_counter() - started
+    )
     yield
-    await engine.dispose()
+    await warm_up.stop()
+    await purger.stop(final_run=False)
+    await audit_log.writer.stop()
+    await stats_refresher.stop(final_run=False)
+    await leaderboard_refresher.stop(final_run=False)
+    await progress_flusher.stop()
+    await counter_flusher.stop()
+    await revocation_rebuilder.stop(final_run=False)
+    await hub.stop()
+    await response_cache.close()
+    await dispose_engines()
+    log_writer.stop()
 
 
-app = FastAPI(
-    lifespan=lifespan,
-    title="E-Learning Platform API",
-)
+def create_app() -> FastAPI:
+    """Build the application; `gunicorn.conf.py` serves `create_app()`."""
+    app = FastAPI(
+        lifespan=lifespan,
+        title="E-Learning Platform API",
+    )
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, custom_rate_limit_handler)  # type: ignore
-app.add_middleware(SlowAPIMiddleware)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, custom_rate_limit_handler)  # type: ignore
+    app.add_middleware(SlowAPIMiddleware)
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.compression_minimum_size
+    )
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        initial_limit=settings.admission_initial_limit,
+        min_limit=settings.admission_min_limit,
+        max_limit=settings.admission_max_limit,
+        latency_target_ms=settings.admission_latency_target_ms,
+        retry_after_seconds=settings.admission_retry_after_seconds,
+        # the stream is long-lived and would pin a slot; probes must not be shed
+        exempt_paths=("/courses/stream", "/ready"),
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if settings.access_log_enabled:
+        # outermost, so the latency includes every other middleware
+        app.add_middleware(
+            AccessLogMiddleware,
+            sample_rate=settings.access_log_sample_rate,
+            slow_ms=settings.access_log_slow_ms,
+        )
+
+    app.include_router(users.router)
+    app.include_router(course.router)
+    app.include_router(category.router)
+    app.include_router(enrollment.router)
+    app.include_router(progress.router)
+    app.include_router(admin.router)
+    app.include_router(auth.router)
+    app.include_router(jwks.router)
+    app.include_router(health.router)
 
+    # add pagination libery
+    add_pagination(app)
+    return app
 
-app.include_router(users.router)
-app.include_router(course.router)
-app.include_router(category.router)
-app.include_router(auth.router)
 
-# add pagination libery
-add_pagination(app)
+app = create_app()
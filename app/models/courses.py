@@ -3,18 +3,41 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database import Base
+from .soft_delete import DELETED, LIVE, SoftDeleteMixin
 
 if TYPE_CHECKING:
     from .categories import Category
     from .users import User
 
 
-class Course(Base):
+class Course(SoftDeleteMixin, Base):
     __tablename__ = "course"
+    # partial indexes: the live ones serve per-author/per-category lookups,
+    # the deleted one lets the purger find its work without a table scan
+    __table_args__ = (
+        Index(
+            "ix_course_author_id_live",
+            "author_id",
+            postgresql_where=LIVE,
+            sqlite_where=LIVE,
+        ),
+        Index(
+            "ix_course_category_id_live",
+            "category_id",
+            postgresql_where=LIVE,
+            sqlite_where=LIVE,
+        ),
+        Index(
+            "ix_course_deleted_at",
+            "deleted_at",
+            postgresql_where=DELETED,
+            sqlite_where=DELETED,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(120), index=True)
@@ -27,6 +50,9 @@ class Course(Base):
 
     category_id: Mapped[int] = mapped_column(ForeignKey("category.id"))
     author_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
+    # counters maintained by batched increments, see app/counters.py
+    enrollment_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    view_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     author: Mapped[User] = relationship(back_populates="courses")
     category: Mapped[Category] = relationship(back_populates="courses")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+
+
+class Enrollment(Base):
+    __tablename__ = "enrollment"
+    # the primary key serves "my courses" (user_id, course_id);
+    # the reverse index serves the course roster
+    __table_args__ = (Index("ix_enrollment_course_id_user_id", "course_id", "user_id"),)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    course_id: Mapped[int] = mapped_column(
+        ForeignKey("course.id", ondelete="CASCADE"), primary_key=True
+    )
+    enrolled_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+    )
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, DateTime, event, text
+from sqlalchemy.orm import (
+    Mapped,
+    ORMExecuteState,
+    Session,
+    mapped_column,
+    with_loader_criteria,
+)
+
+# partial-index predicates, shared by the models and their migration
+LIVE = text("deleted_at IS NULL")
+DELETED = text("deleted_at IS NOT NULL")
+
+
+class SoftDeleteMixin:
+    """Rows are marked deleted and hard-deleted later by `app.purge`.
+
+    ORM queries through a session skip deleted rows automatically (see
+    below); Core queries on a plain connection must add `Model.live()`.
+    """
+
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), default=None
+    )
+
+    @classmethod
+    def live(cls) -> ColumnElement[bool]:
+        return cls.deleted_at.is_(None)
+
+    def soft_delete(self) -> None:
+        self.deleted_at = datetime.now(UTC)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _skip_deleted_rows(state: ORMExecuteState) -> None:
+    # covers selects, joins, Session.get and relationship loads; the purger
+    # opts out with execution_options(include_deleted=True)
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.execution_options.get("include_deleted", False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+            )
+        )
+
+
+def include_deleted(statement: Any) -> Any:
+    return statement.execution_options(include_deleted=True)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_token"
+
+    jti: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # rows are purged once the token would have expired anyway
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
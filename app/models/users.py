@@ -2,22 +2,40 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database import Base
+from .soft_delete import DELETED, LIVE, SoftDeleteMixin
 
 if TYPE_CHECKING:
     from .courses import Course
 
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
     __tablename__ = "user"
+    # an email is unique among live users only, so it can sign up again
+    # once its deleted account is marked
+    __table_args__ = (
+        Index(
+            "uq_user_email_live",
+            "email",
+            unique=True,
+            postgresql_where=LIVE,
+            sqlite_where=LIVE,
+        ),
+        Index(
+            "ix_user_deleted_at",
+            "deleted_at",
+            postgresql_where=DELETED,
+            sqlite_where=DELETED,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(120), index=True)
     bio: Mapped[str] = mapped_column(String(160), default=None)
-    email: Mapped[str] = mapped_column(String(120), index=True, unique=True)
+    email: Mapped[str] = mapped_column(String(120))
     role: Mapped[str] = mapped_column(String(50))
     hashed_password: Mapped[str]
 
@@ -0,0 +1,162 @@
+"""Alembic helpers for changing large tables without stopping writes.
+
+Use them from migration scripts in place of the plain `op` calls:
+
+    from app.online_migrations import backfill, create_index_concurrently
+
+    def upgrade() -> None:
+        op.add_column("course", sa.Column("level", sa.String(), nullable=True))
+        backfill("course", {"level": "beginner"}, where="level IS NULL")
+        create_index_concurrently("ix_course_level", "course", ["level"])
+
+A new column goes in nullable and without a volatile default (a metadata-only
+change), then gets filled by `backfill` in small committed batches. Indexes are
+built with `CREATE INDEX CONCURRENTLY`, which can't run in a transaction, so
+`migrations/env.py` runs each migration in its own transaction and these
+helpers step out of it with `autocommit_block()`. env.py also sets
+`lock_timeout`, so DDL that can't get its lock fails fast instead of queueing
+every query on the table behind it. Either way the migration can be rerun.
+
+On SQLite there is nothing concurrent to ask for; the helpers fall back to
+the plain operations.
+"""
+
+import time
+from contextlib import contextmanager, suppress
+from typing import Any, Iterator
+
+import sqlalchemy as sa
+from alembic import op
+
+from .env_loader import settings
+
+
+def _offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _invalid_index_exists(index_name: str) -> bool:
+    # a failed concurrent build leaves an INVALID index behind that IF NOT
+    # EXISTS would happily skip
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid"
+            " WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+        ),
+        {"name": index_name},
+    )
+    return result.first() is not None
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: list[str], **kw: Any
+) -> None:
+    """`op.create_index` that doesn't block writes on PostgreSQL."""
+    if not _is_postgresql():
+        op.create_index(index_name, table_name, columns, **kw)
+        return
+    with op.get_context().autocommit_block():
+        if not _offline() and _invalid_index_exists(index_name):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """`op.drop_index` that doesn't block writes on PostgreSQL."""
+    if not _is_postgresql():
+        op.drop_index(index_name, table_name=table_name)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+@contextmanager
+def lock_timeout(milliseconds: int) -> Iterator[None]:
+    """Override env.py's `lock_timeout` for the statements in the block."""
+    if not _is_postgresql():
+        yield
+        return
+    previous = (
+        "DEFAULT"
+        if _offline()
+        else repr(op.get_bind().exec_driver_sql("SHOW lock_timeout").scalar())
+    )
+    reset = f"SET lock_timeout = {previous}"
+    op.execute(f"SET lock_timeout = {int(milliseconds)}")
+    try:
+        yield
+    except BaseException:
+        # a failed statement aborts the transaction, whose rollback undoes the
+        # SET as well; there the reset can only fail and hide the real error
+        with suppress(sa.exc.DBAPIError):
+            op.execute(reset)
+        raise
+    op.execute(reset)
+
+
+def backfill(
+    table_name: str,
+    values: dict[str, Any],
+    where: str,
+    key: str = "id",
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+) -> int:
+    """Fill columns in committed batches of `batch_size` rows; returns the count.
+
+    Rows are taken in `key` order, so each batch is a short index range scan
+    and row locks are held only for that batch. `pause_seconds` between
+    batches leaves room for replication and the application's own writes.
+    `where` should stop matching a row once it is filled, so an interrupted
+    backfill can simply be run again. Offline (`--sql`) mode emits one
+    unbatched UPDATE.
+    """
+    batch_size = batch_size or settings.migration_backfill_batch_size
+    if pause_seconds is None:
+        pause_seconds = settings.migration_backfill_pause_seconds
+    table = sa.table(table_name, sa.column(key), *(sa.column(c) for c in values))
+    pk = table.c[key]
+    condition = sa.text(where)
+
+    if _offline():
+        op.execute(table.update().where(condition).values(values))
+        return 0
+
+    total = 0
+    last = None
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        while True:
+            query = sa.select(pk).where(condition).order_by(pk).limit(batch_size)
+            if last is not None:
+                query = query.where(pk > last)
+            keys = conn.execute(query).scalars().all()
+            if not keys:
+                break
+            conn.execute(table.update().where(pk.in_(keys)).values(values))
+            total += len(keys)
+            last = keys[-1]
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    return total
@@ -0,0 +1,122 @@
+"""On-demand profiling of a live worker, for the `/admin/profile` endpoints.
+
+The CPU profiler is a sampler: a background thread wakes every few
+milliseconds and records the stack of every other thread, so the code being
+profiled runs unmodified and the cost is one stack walk per thread per tick.
+Output is the collapsed-stack format read by flamegraph.pl, speedscope and
+inferno (`frame;frame;frame count`, root first).
+
+The memory profiler turns `tracemalloc` on for a window and reports the
+source lines whose allocations grew the most. Tracing slows allocation-heavy
+code noticeably, which is why it is only on for that window.
+
+Both profile the worker that handles the request; with several workers,
+repeat the call to reach the others.
+"""
+
+import asyncio
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from types import CodeType, FrameType
+
+# one profile per worker at a time
+profile_lock = asyncio.Lock()
+
+# allocations by the profiler itself and the import system are noise
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._labels: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = (
+                f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+            )
+        return label
+
+    def _collapse(self, thread_name: str, frame: FrameType | None) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread_name)
+        return ";".join(reversed(labels))
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != own:
+                name = names.get(ident, f"thread-{ident}")
+                self.stacks[self._collapse(name, frame)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+async def profile_cpu(seconds: float, interval: float) -> SamplingProfiler:
+    """Sample this worker for `seconds` while it keeps serving requests."""
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        await asyncio.to_thread(profiler.stop)
+    return profiler
+
+
+def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+    return snapshot.filter_traces(
+        [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+    )
+
+
+async def profile_memory(seconds: float, frames: int, limit: int) -> list[dict]:
+    """Top allocation growth, by source line, over the next `seconds`."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    try:
+        before = _filtered(tracemalloc.take_snapshot())
+        await asyncio.sleep(seconds)
+        after = _filtered(tracemalloc.take_snapshot())
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    stats = after.compare_to(before, "lineno")
+    return [
+        {
+            "file": stat.traceback[0].filename,
+            "line": stat.traceback[0].lineno,
+            "size_diff": stat.size_diff,
+            "size": stat.size,
+            "count_diff": stat.count_diff,
+        }
+        for stat in stats[:limit]
+    ]
@@ -0,0 +1,120 @@
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+from sqlalchemy import Insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .models.progress import WatchProgress
+
+
+class Heartbeat(NamedTuple):
+    position_seconds: int
+    updated_at: datetime
+
+
+def upsert_statement(dialect_name: str) -> Insert:
+    """Insert-or-update that never lets an older heartbeat overwrite a newer one."""
+    insert = postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+    table = WatchProgress.__table__
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.course_id],
+        set_={
+            "position_seconds": stmt.excluded.position_seconds,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=table.c.updated_at < stmt.excluded.updated_at,
+    )
+
+
+class ProgressBuffer:
+    """Latest watch position per (user, course), written behind in batches.
+
+    Heartbeats only overwrite an in-memory entry; a flush upserts every
+    entry in one executemany, so a viewer costs one row write per flush
+    interval instead of one per heartbeat.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[tuple[int, int], Heartbeat] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    def record(self, user_id: int, course_id: int, position_seconds: int) -> Heartbeat:
+        heartbeat = Heartbeat(position_seconds, datetime.now(UTC))
+        self._pending[(user_id, course_id)] = heartbeat
+        return heartbeat
+
+    def get(self, user_id: int, course_id: int) -> Heartbeat | None:
+        return self._pending.get((user_id, course_id))
+
+    async def flush(self, db: AsyncSession) -> int:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        rows = [
+            {
+                "user_id": user_id,
+                "course_id": course_id,
+                "position_seconds": heartbeat.position_seconds,
+                "updated_at": heartbeat.updated_at,
+            }
+            for (user_id, course_id), heartbeat in sorted(pending.items())
+        ]
+        stmt = upsert_statement(db.get_bind().dialect.name)
+        try:
+            await db.execute(stmt, rows)
+            await db.commit()
+        except IntegrityError:
+            # a course or user vanished since the heartbeat: retry row by row
+            # and drop only the rows that no longer fit
+            await db.rollback()
+            written = 0
+            for row in rows:
+                try:
+                    await db.execute(stmt, row)
+                    await db.commit()
+                    written += 1
+                except IntegrityError:
+                    await db.rollback()
+            return written
+        except Exception:
+            # keep the positions for the next flush unless newer ones arrived
+            for key, heartbeat in pending.items():
+                self._pending.setdefault(key, heartbeat)
+            raise
+        return len(rows)
+
+    async def read(
+        self, db: AsyncSession, user_id: int, course_id: int
+    ) -> Heartbeat | None:
+        """Merge the buffered heartbeat with the persisted row; newest wins."""
+        buffered = self.get(user_id, course_id)
+        stored = await db.get(WatchProgress, (user_id, course_id))
+        if stored is None:
+            return buffered
+        persisted = Heartbeat(stored.position_seconds, as_utc(stored.updated_at))
+        if buffered is None or persisted.updated_at > buffered.updated_at:
+            return persisted
+        return buffered
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+progress_buffer = ProgressBuffer()
+
+
+async def flush_progress() -> None:
+    async with AsyncSessionLocal() as db:
+        await progress_buffer.flush(db)
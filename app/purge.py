@@ -0,0 +1,126 @@
+"""Hard-delete soft-deleted courses and users, a little at a time, off-peak.
+
+Deleting only marks rows (`deleted_at`), so the request returns at once. This
+task removes rows that have been deleted for longer than the retention
+period, but only inside the configured off-peak window. It works in small
+batches, each its own short transaction, with a pause between them, so
+locks are held briefly and concurrent writers keep moving. A run stops after
+`purge_max_batches` batches; the next run carries on.
+
+Dependent enrollment and watch-progress rows are deleted explicitly, ahead
+of their course or user, rather than relying on ON DELETE CASCADE inside
+one large statement. A deleted user's enrollments were already taken off
+`Course.enrollment_count` when the user was deleted, so removing them here
+leaves the counter alone.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .env_loader import settings
+from .models.courses import Course
+from .models.enrollments import Enrollment
+from .models.progress import WatchProgress
+from .models.soft_delete import include_deleted
+from .models.users import User
+
+logger = logging.getLogger(__name__)
+
+
+def in_window(now: datetime, start_hour: int, end_hour: int) -> bool:
+    """Whether `now` (UTC) falls in [start_hour, end_hour), which may wrap midnight."""
+    hour = now.hour
+    if start_hour <= end_hour:
+        return start_hour <= hour < end_hour
+    return hour >= start_hour or hour < end_hour
+
+
+class Purger:
+    def __init__(
+        self,
+        retention: timedelta,
+        batch_size: int,
+        pause: float,
+        max_batches: int,
+    ) -> None:
+        self.retention = retention
+        self.batch_size = batch_size
+        self.pause = pause
+        self.max_batches = max_batches
+
+    async def _due_ids(self, db: AsyncSession, model: type, *where: Any) -> list:
+        query = select(model.id).where(*where).order_by(model.id).limit(self.batch_size)
+        return list((await db.scalars(include_deleted(query))).all())
+
+    async def _course_batch(self, db: AsyncSession, cutoff: datetime) -> int:
+        ids = await self._due_ids(db, Course, Course.deleted_at <= cutoff)
+        if ids:
+            await db.execute(delete(Enrollment).where(Enrollment.course_id.in_(ids)))
+            await db.execute(
+                delete(WatchProgress).where(WatchProgress.course_id.in_(ids))
+            )
+            await db.execute(delete(Course).where(Course.id.in_(ids)))
+        await db.commit()
+        return len(ids)
+
+    async def _user_batch(self, db: AsyncSession, cutoff: datetime) -> int:
+        # a user goes only once none of their courses are left
+        ids = await self._due_ids(
+            db,
+            User,
+            User.deleted_at <= cutoff,
+            ~exists().where(Course.author_id == User.id),
+        )
+        if ids:
+            await db.execute(delete(Enrollment).where(Enrollment.user_id.in_(ids)))
+            await db.execute(
+                delete(WatchProgress).where(WatchProgress.user_id.in_(ids))
+            )
+            await db.execute(delete(User).where(User.id.in_(ids)))
+        await db.commit()
+        return len(ids)
+
+    async def run(self, db: AsyncSession, now: datetime) -> dict[str, int]:
+        """Purge up to `max_batches` batches; returns rows removed per table."""
+        cutoff = now - self.retention
+        purged = {"course": 0, "user": 0}
+        batches = 0
+        # courses first: they reference their author
+        for table, purge_batch in (
+            ("course", self._course_batch),
+            ("user", self._user_batch),
+        ):
+            while batches < self.max_batches:
+                count = await purge_batch(db, cutoff)
+                batches += 1
+                purged[table] += count
+                if count < self.batch_size:
+                    break
+                await asyncio.sleep(self.pause)
+        return purged
+
+
+soft_delete_purger = Purger(
+    retention=timedelta(hours=settings.purge_retention_hours),
+    batch_size=settings.purge_batch_size,
+    pause=settings.purge_pause_seconds,
+    max_batches=settings.purge_max_batches,
+)
+
+
+async def purge_deleted() -> None:
+    now = datetime.now(UTC)
+    if not in_window(
+        now, settings.purge_window_start_hour, settings.purge_window_end_hour
+    ):
+        return
+    async with AsyncSessionLocal() as db:
+        purged = await soft_delete_purger.run(db, now)
+    if any(purged.values()):
+        logger.info("purged soft-deleted rows", extra={"purged": purged})
@@ -0,0 +1,29 @@
+"""Explicit column lists for read-only endpoints.
+
+Selecting these on a connection from `read_connection` returns `Row` tuples,
+which the response schemas read by attribute just like ORM instances, minus
+the identity map, instrumentation and lazy-load state of each object.
+Keep them in step with the schemas they feed. Plain connections bypass the
+session's soft-delete filter, so queries on courses and users add
+`Model.live()` themselves.
+"""
+
+from .models.categories import Category
+from .models.courses import Course
+from .models.users import User
+
+# ReadCourseSchema
+COURSE_COLUMNS = (
+    Course.id,
+    Course.title,
+    Course.description,
+    Course.video_id,
+    Course.author_id,
+    Course.category_id,
+)
+
+# UserReadSchema; never hashed_password
+USER_COLUMNS = (User.id, User.name, User.bio, User.email, User.role)
+
+# CategoryBaseSchema
+CATEGORY_COLUMNS = (Category.name,)
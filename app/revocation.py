@@ -0,0 +1,127 @@
+import hashlib
+import math
+from datetime import UTC, datetime
+from typing import Iterator
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import database
+from .broadcast import hub
+from .env_loader import settings
+from .models.tokens import RevokedToken
+
+REVOCATION_TOPIC = "auth.revoked"
+
+
+def user_key(user_id: int | str) -> str:
+    """Revocation id that covers every token issued to one user."""
+    return f"user:{user_id}"
+
+
+class BloomFilter:
+    """Fixed-size set of strings: no false negatives, rare false positives.
+
+    Sized for `capacity` items at `error_rate`; adding more only raises the
+    false positive rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(
+            64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """Revoked token ids, persisted in `revoked_token` and checked in memory.
+
+    Each worker holds a Bloom filter of the unexpired ids, rebuilt from the
+    table periodically and updated through the broadcast hub whenever any
+    worker revokes a token. A miss, which is almost every request, costs no
+    query; a hit is confirmed against the table.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        # ids added since the current rebuild started reading the table
+        self._added: set[str] = set()
+
+    def add(self, jti: str) -> None:
+        self._filter.add(jti)
+        self._added.add(jti)
+
+    def on_message(self, message: dict) -> None:
+        self.add(message["data"]["jti"])
+
+    async def is_revoked(self, jti: str) -> bool:
+        if jti not in self._filter:
+            return False
+        async with database.reader().connect() as conn:
+            result = await conn.execute(
+                select(RevokedToken.jti).where(RevokedToken.jti == jti)
+            )
+            return result.first() is not None
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: datetime) -> bool:
+        """Persist and announce a revocation; False if it was already revoked."""
+        db.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return False
+        self.add(jti)
+        await hub.publish(REVOCATION_TOPIC, "revoked", {"jti": jti})
+        return True
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """Purge expired rows and swap in a filter built from the rest."""
+        self._added = set()
+        now = datetime.now(UTC)
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await db.commit()
+        result = await db.execute(
+            select(RevokedToken.jti).where(RevokedToken.expires_at > now)
+        )
+        jtis = result.scalars().all()
+        fresh = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        # revocations announced while the query ran may be missing from it
+        for jti in (*jtis, *self._added):
+            fresh.add(jti)
+        self._filter = fresh
+        return len(jtis)
+
+
+revocation_list = RevocationList(
+    capacity=settings.revocation_filter_capacity,
+    error_rate=settings.revocation_filter_error_rate,
+)
+hub.add_listener(REVOCATION_TOPIC, revocation_list.on_message)
+
+
+async def rebuild_revocations() -> None:
+    async with database.AsyncSessionLocal() as db:
+        await revocation_list.rebuild(db)
@@ -0,0 +1,75 @@
+import os
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+
+from ..dependencies import is_admin
+from ..env_loader import settings
+from ..limiter import limiter
+from ..profiling import profile_cpu, profile_lock, profile_memory
+from ..schemas.admin import AdminStatsSchema, AllocationDiffSchema
+from ..stats import stats_snapshot
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+ProfileSeconds = Annotated[float, Query(gt=0, le=settings.profiling_max_seconds)]
+
+
+@router.get("/stats", response_model=AdminStatsSchema, status_code=status.HTTP_200_OK)
+@limiter.limit("30/minute")
+async def get_stats(
+    request: Request,
+    is_admin: Annotated[bool, Depends(is_admin)],
+) -> dict:
+    """Platform analytics from the background-refreshed snapshot."""
+    await stats_snapshot.ensure_fresh()
+    return {"generated_at": stats_snapshot.generated_at, **stats_snapshot.data}
+
+
+async def profiling_enabled(is_admin: Annotated[bool, Depends(is_admin)]) -> bool:
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if profile_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running on this worker",
+        )
+    return True
+
+
+@router.get("/profile/cpu", response_class=PlainTextResponse)
+@limiter.limit("6/minute")
+async def get_cpu_profile(
+    request: Request,
+    enabled: Annotated[bool, Depends(profiling_enabled)],
+    seconds: ProfileSeconds = 10.0,
+    interval_ms: Annotated[float, Query(ge=1, le=100)] = settings.profiling_interval_ms,
+) -> PlainTextResponse:
+    """Sample this worker's stacks; returns a collapsed-stack (flamegraph) file."""
+    async with profile_lock:
+        profiler = await profile_cpu(seconds, interval_ms / 1000)
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="cpu-{os.getpid()}.collapsed"'
+            ),
+            "X-Profile-Samples": str(profiler.samples),
+        },
+    )
+
+
+@router.get("/profile/memory", response_model=list[AllocationDiffSchema])
+@limiter.limit("6/minute")
+async def get_memory_profile(
+    request: Request,
+    enabled: Annotated[bool, Depends(profiling_enabled)],
+    seconds: ProfileSeconds = 10.0,
+    limit: Annotated[int, Query(ge=1, le=200)] = 25,
+) -> list[dict]:
+    """Source lines whose allocations grew the most while tracing."""
+    async with profile_lock:
+        return await profile_memory(
+            seconds, settings.profiling_tracemalloc_frames, limit
+        )
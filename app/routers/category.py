@@ -1,31 +1,50 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..dependencies import current_user_dependency, is_admin
+from ..audit import audit_log
+from ..cache import cached_response, response_cache
+from ..database import get_db, read_connection
+from ..deadline import deadline
+from ..dependencies import current_user_dependency, is_admin, request_actor
+from ..idempotency import idempotent
 from ..limiter import limiter
 from ..models.categories import Category
+from ..readpath import CATEGORY_COLUMNS
 from ..schemas.category import CategoryBaseSchema
+from .course import COURSE_CACHE
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+CATEGORY_CACHE = "categories"
+
+category_list_adapter = TypeAdapter(dict[str, list[CategoryBaseSchema]])
+
 
 @router.get(
     "/",
     status_code=status.HTTP_302_FOUND,
     response_model=dict[str, list[CategoryBaseSchema]],
 )
+@deadline(5)
 async def get_category(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
     is_authorized: Annotated[bool, Depends(current_user_dependency)],
-) -> dict:
-    result = await db.execute(select(Category))
-    categories = result.scalars()
+) -> Response:
+    async def load_categories() -> bytes:
+        async with read_connection(request) as conn:
+            result = await conn.execute(select(*CATEGORY_COLUMNS))
+        categories = category_list_adapter.validate_python(
+            {"category": result.all()}, from_attributes=True
+        )
+        return category_list_adapter.dump_json(categories)
 
-    return {"category": categories}
+    return await cached_response(
+        request, CATEGORY_CACHE, load_categories, status_code=status.HTTP_302_FOUND
+    )
 
 
 @router.post(
@@ -34,6 +53,8 @@ async def get_category(
     response_model=dict[str, CategoryBaseSchema],
 )
 @limiter.limit("10/minute")
+@deadline(10)
+@idempotent
 async def create_category(
     request: Request,
     category: CategoryBaseSchema,
@@ -45,11 +66,20 @@ async def create_category(
     db.add(db_category)
     await db.commit()
     await db.refresh(db_category)
+    audit_log.record(
+        "category.create",
+        actor_id=request_actor(request),
+        target_type="category",
+        target_id=db_category.id,
+        detail={"name": db_category.name},
+    )
+    await response_cache.invalidate(CATEGORY_CACHE)
     return {"category": db_category}
 
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("10/minute")
+@deadline(10)
 async def delete_category(
     request: Request,
     categoty_id: int,
@@ -64,4 +94,13 @@ async def delete_category(
         )
     await db.delete(category)
     await db.commit()
+    audit_log.record(
+        "category.delete",
+        actor_id=request_actor(request),
+        target_type="category",
+        target_id=categoty_id,
+        detail={"name": category.name},
+    )
+    # the category's courses may have gone with it
+    await response_cache.invalidate(CATEGORY_CACHE, COURSE_CACHE)
     return
@@ -1,40 +1,128 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page
 from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from ..database import get_db
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from ..audit import audit_log
+from ..broadcast import hub
+from ..cache import cached_response, response_cache
+from ..counters import view_counter
+from ..database import get_db, get_read_conn, read_connection
+from ..deadline import deadline
 from ..dependencies import (
     current_user_dependency,
     is_teacher_or_admin,
+    request_actor,
 )
+from ..idempotency import idempotent
+from ..leaderboard import leaderboard
 from ..limiter import limiter
 from ..models.courses import Course
+from ..readpath import COURSE_COLUMNS
 from ..schemas.course import (
     CourseBaseSchema,
+    CourseBatchSchema,
     CreateCourseSchema,
+    LeaderboardSchema,
     ReadCourseSchema,
     UpdateCourseSchema,
 )
-from .utils import category_check
+from .utils import category_check, in_request_order, parse_id_list
 
 router = APIRouter(prefix="/courses", tags=["courses"])
 
+COURSE_TOPIC = "courses"
+COURSE_CACHE = "courses"
+
 
-@router.get("/")
+@router.get("/", response_model=Page[ReadCourseSchema])
 @limiter.limit("5/second")
 @limiter.limit("100/hour")
+@deadline(5)
 async def get_courses(
     request: Request,  # for Limiter to perform
-    db: Annotated[AsyncSession, Depends(get_db)],
     is_authorized: Annotated[bool, Depends(current_user_dependency)],
-) -> Page[ReadCourseSchema]:
+) -> Response:
     """Retrieve a list of courses with pagination."""
-    query = select(Course)
-    return await paginate(db, query)
+
+    async def load_page() -> bytes:
+        query = select(*COURSE_COLUMNS).where(Course.live())
+        async with read_connection(request) as conn:
+            page = await paginate(conn, query)
+        return page.model_dump_json().encode()
+
+    return await cached_response(request, COURSE_CACHE, load_page)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+@limiter.limit("10/minute")
+async def stream_courses(
+    request: Request,
+    is_authorized: Annotated[bool, Depends(current_user_dependency)],
+) -> StreamingResponse:
+    """Server-Sent Events feed of course created/updated/deleted events."""
+    return StreamingResponse(
+        hub.sse_stream(request, COURSE_TOPIC),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/popular", response_model=LeaderboardSchema)
+@limiter.limit("5/second")
+async def popular_courses(
+    request: Request,
+    is_authorized: Annotated[bool, Depends(current_user_dependency)],
+    category_id: int | None = None,
+) -> dict:
+    """Most viewed courses, overall or per category, from the precomputed board."""
+    return {
+        "generated_at": leaderboard.generated_at,
+        "category_id": category_id,
+        "courses": leaderboard.top(category_id),
+    }
+
+
+@router.get("/batch", response_model=CourseBatchSchema)
+@limiter.limit("5/second")
+@limiter.limit("100/hour")
+@deadline(5)
+async def get_courses_batch(
+    request: Request,
+    ids: str,
+    conn: Annotated[AsyncConnection, Depends(get_read_conn)],
+    is_authorized: Annotated[bool, Depends(current_user_dependency)],
+) -> dict:
+    """Fetch many courses by id (`?ids=3,1,2`) in one query, in request order."""
+    course_ids = parse_id_list(ids)
+    result = await conn.execute(
+        select(*COURSE_COLUMNS).where(Course.id.in_(course_ids), Course.live())
+    )
+    return in_request_order(course_ids, result.all())
+
+
+@router.get("/{course_id}", response_model=ReadCourseSchema)
+@limiter.limit("5/second")
+@limiter.limit("100/hour")
+@deadline(5)
+async def get_course(
+    request: Request,
+    course_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    is_authorized: Annotated[bool, Depends(current_user_dependency)],
+) -> Course:
+    """Retrieve a single course and count the view."""
+    course = await db.get(Course, course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    view_counter.add(course_id)
+    return course
 
 
 @router.post(
@@ -42,6 +130,8 @@ async def get_courses(
 )
 @limiter.limit("3/second")
 @limiter.limit("100/hour")
+@deadline(10)
+@idempotent
 async def create_course(
     request: Request,
     course_in: CreateCourseSchema,
@@ -62,11 +152,20 @@ async def create_course(
     db.add(db_course)
     await db.commit()
     await db.refresh(db_course)
+    audit_log.record(
+        "course.create",
+        actor_id=request_actor(request),
+        target_type="course",
+        target_id=db_course.id,
+    )
+    await response_cache.invalidate(COURSE_CACHE)
+    await hub.publish(COURSE_TOPIC, "course.created", {"id": db_course.id})
     return {"courses": db_course}
 
 
 @router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("2/minute")
+@deadline(10)
 async def delete_course(
     request: Request,
     course_id: int,
@@ -74,7 +173,7 @@ async def delete_course(
     current_user: Annotated[dict, Depends(current_user_dependency)],
     is_authorized: Annotated[bool, Depends(is_teacher_or_admin)],
 ) -> None:
-    """Delete a course by its ID"""
+    """Delete a course by its ID; rows are purged later, off-peak."""
     course = await db.get(Course, course_id)
 
     if not course:
@@ -89,13 +188,22 @@ async def delete_course(
             detail="You do not have permission to delete this course",
         )
 
-    await db.delete(course)
+    course.soft_delete()
     await db.commit()
+    audit_log.record(
+        "course.delete",
+        actor_id=request_actor(request),
+        target_type="course",
+        target_id=course_id,
+    )
+    await response_cache.invalidate(COURSE_CACHE)
+    await hub.publish(COURSE_TOPIC, "course.deleted", {"id": course_id})
     return
 
 
 @router.patch("/{course_id}", response_model=dict[str, CourseBaseSchema])
 @limiter.limit("10/minute")  # Very strict
+@deadline(10)
 async def update_course(
     request: Request,
     course_id: int,
@@ -133,4 +241,6 @@ async def update_course(
     db.add(course)
     await db.commit()
     await db.refresh(course)
+    await response_cache.invalidate(COURSE_CACHE)
+    await hub.publish(COURSE_TOPIC, "course.updated", {"id": course.id})
     return {"course": course}
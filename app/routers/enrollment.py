@@ -0,0 +1,154 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..counters import enrollment_counter
+from ..database import get_db
+from ..deadline import deadline
+from ..dependencies import current_user_dependency, is_teacher_or_admin
+from ..limiter import limiter
+from ..models.courses import Course
+from ..models.enrollments import Enrollment
+from ..models.users import User
+from ..schemas.enrollment import EnrollmentReadSchema, MyCoursesPage, RosterPage
+
+router = APIRouter(prefix="/enrollments", tags=["enrollments"])
+
+PageSize = Annotated[int, Query(ge=1, le=100)]
+
+
+def next_after(rows: list, limit: int, key: str) -> int | None:
+    """Keyset cursor: the last key of a full page, None if nothing follows."""
+    if len(rows) <= limit:
+        return None
+    return getattr(rows[limit - 1], key)
+
+
+@router.post(
+    "/{course_id}",
+    response_model=EnrollmentReadSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+@limiter.limit("10/minute")
+@deadline(10)
+async def enroll(
+    request: Request,
+    course_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[dict, Depends(current_user_dependency)],
+) -> Enrollment:
+    """Enroll the current user in a course."""
+    if await db.get(Course, course_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+
+    enrollment = Enrollment(user_id=int(current_user["id"]), course_id=course_id)
+    try:
+        db.add(enrollment)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Already enrolled in this course."},
+        )
+    enrollment_counter.add(course_id, 1)
+    return enrollment
+
+
+@router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
+@limiter.limit("10/minute")
+@deadline(10)
+async def unenroll(
+    request: Request,
+    course_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[dict, Depends(current_user_dependency)],
+) -> None:
+    """Remove the current user from a course."""
+    result = await db.execute(
+        delete(Enrollment).where(
+            Enrollment.user_id == int(current_user["id"]),
+            Enrollment.course_id == course_id,
+        )
+    )
+    await db.commit()
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Enrollment not found"
+        )
+    enrollment_counter.add(course_id, -1)
+
+
+@router.get("/me", response_model=MyCoursesPage)
+@limiter.limit("30/minute")
+@deadline(5)
+async def my_courses(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[dict, Depends(current_user_dependency)],
+    after: int = 0,
+    limit: PageSize = 20,
+) -> dict:
+    """Courses the current user is enrolled in, ordered by course id."""
+    query = (
+        select(Course)
+        .join(Enrollment, Enrollment.course_id == Course.id)
+        .where(
+            Enrollment.user_id == int(current_user["id"]),
+            Enrollment.course_id > after,
+        )
+        .order_by(Enrollment.course_id)
+        .limit(limit + 1)
+    )
+    courses = (await db.execute(query)).scalars().all()
+    return {"items": courses[:limit], "next_after": next_after(courses, limit, "id")}
+
+
+@router.get("/courses/{course_id}", response_model=RosterPage)
+@limiter.limit("30/minute")
+@deadline(5)
+async def course_roster(
+    request: Request,
+    course_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[dict, Depends(current_user_dependency)],
+    is_authorized: Annotated[bool, Depends(is_teacher_or_admin)],
+    after: int = 0,
+    limit: PageSize = 20,
+) -> dict:
+    """Students enrolled in a course, ordered by user id."""
+    course = await db.get(Course, course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+
+    # Ownership check
+    if current_user.get("role") != "admin" and str(course.author_id) != str(
+        current_user.get("id")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view this roster",
+        )
+
+    query = (
+        select(User)
+        .join(Enrollment, Enrollment.user_id == User.id)
+        .where(Enrollment.course_id == course_id, Enrollment.user_id > after)
+        .order_by(Enrollment.user_id)
+        .limit(limit + 1)
+    )
+    users = (await db.execute(query)).scalars().all()
+    return {
+        "course_id": course_id,
+        "enrollment_count": course.enrollment_count
+        + enrollment_counter.pending(course_id),
+        "items": users[:limit],
+        "next_after": next_after(users, limit, "id"),
+    }
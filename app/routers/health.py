@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request, Response, status
+from fastapi.responses import JSONResponse
+
+from ..limiter import limiter
+from ..warmup import warm_up
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/ready")
+@limiter.exempt
+async def ready(request: Request) -> Response:
+    """Load balancer readiness probe: 503 until this worker has warmed up."""
+    if not warm_up.ready:
+        return JSONResponse(
+            {"status": "warming up"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+    return JSONResponse({"status": "ready", "warmup": warm_up.report})
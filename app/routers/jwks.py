@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request, Response, status
+
+from ..auth.keys import keyring
+from ..env_loader import settings
+
+router = APIRouter(tags=["auth"])
+
+
+@router.get("/.well-known/jwks.json")
+async def get_jwks(request: Request) -> Response:
+    """Public signing keys, for services that verify our tokens themselves."""
+    headers = {
+        "Cache-Control": f"public, max-age={settings.jwks_max_age_seconds}",
+        "ETag": keyring.jwks_etag,
+    }
+    if request.headers.get("if-none-match") == keyring.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=keyring.jwks_json, media_type="application/json", headers=headers
+    )
@@ -0,0 +1,50 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_db
+from ..deadline import deadline
+from ..dependencies import current_user_dependency
+from ..limiter import limiter
+from ..progress import progress_buffer
+from ..schemas.progress import ProgressReadSchema, ProgressUpdateSchema
+
+router = APIRouter(prefix="/progress", tags=["progress"])
+
+
+@router.put(
+    "/{course_id}",
+    response_model=ProgressReadSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@limiter.limit("20/minute")
+async def record_progress(
+    request: Request,
+    course_id: int,
+    progress: ProgressUpdateSchema,
+    current_user: Annotated[dict, Depends(current_user_dependency)],
+) -> dict:
+    """Watch-progress heartbeat; buffered in memory and written in batches."""
+    heartbeat = progress_buffer.record(
+        int(current_user["id"]), course_id, progress.position_seconds
+    )
+    return {"course_id": course_id, **heartbeat._asdict()}
+
+
+@router.get("/{course_id}", response_model=ProgressReadSchema)
+@limiter.limit("30/minute")
+@deadline(5)
+async def get_progress(
+    request: Request,
+    course_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[dict, Depends(current_user_dependency)],
+) -> dict:
+    """Current user's latest watch position for a course."""
+    heartbeat = await progress_buffer.read(db, int(current_user["id"]), course_id)
+    if heartbeat is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="No progress recorded"
+        )
+    return {"course_id": course_id, **heartbeat._asdict()}
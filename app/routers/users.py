@@ -1,16 +1,29 @@
+from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi_pagination import Page
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
-from ..database import get_db
-from ..dependencies import is_admin
+from ..audit import audit_log
+from ..broadcast import hub
+from ..cache import response_cache
+from ..counters import enrollment_counter
+from ..database import get_db, get_read_conn
+from ..deadline import deadline
+from ..dependencies import is_admin, request_actor
+from ..env_loader import settings
 from ..limiter import limiter
+from ..models.courses import Course
+from ..models.enrollments import Enrollment
 from ..models.users import User
-from ..schemas.user import UserReadSchema
+from ..readpath import USER_COLUMNS
+from ..revocation import revocation_list, user_key
+from ..schemas.user import UserBatchSchema, UserReadSchema
+from .course import COURSE_CACHE, COURSE_TOPIC
+from .utils import in_request_order, parse_id_list
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -20,19 +33,38 @@ router = APIRouter(prefix="/users", tags=["users"])
     status_code=status.HTTP_200_OK,
 )
 @limiter.limit("10/minute")
+@deadline(5)
 async def get_users(
     request: Request,  # for Limiter to perform
-    db: Annotated[AsyncSession, Depends(get_db)],
+    conn: Annotated[AsyncConnection, Depends(get_read_conn)],
     is_admin: Annotated[bool, Depends(is_admin)],
     offset: int = 0,
 ) -> Page[UserReadSchema]:
     """get all users"""
-    query = select(User)
-    return await paginate(db, query)
+    query = select(*USER_COLUMNS).where(User.live())
+    return await paginate(conn, query)
+
+
+@router.get("/batch", response_model=UserBatchSchema)
+@limiter.limit("10/minute")
+@deadline(5)
+async def get_users_batch(
+    request: Request,
+    ids: str,
+    conn: Annotated[AsyncConnection, Depends(get_read_conn)],
+    is_admin: Annotated[bool, Depends(is_admin)],
+) -> dict:
+    """Fetch many users by id (`?ids=3,1,2`) in one query, in request order."""
+    user_ids = parse_id_list(ids)
+    result = await conn.execute(
+        select(*USER_COLUMNS).where(User.id.in_(user_ids), User.live())
+    )
+    return in_request_order(user_ids, result.all())
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("10/minute")
+@deadline(10)
 async def delete_user(
     request: Request,
     id: int,
@@ -44,5 +76,33 @@ async def delete_user(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    await db.delete(user)
+    enrolled_in = list(
+        await db.scalars(select(Enrollment.course_id).where(Enrollment.user_id == id))
+    )
+    # mark the user and their courses; app.purge removes the rows off-peak
+    user.soft_delete()
+    deleted_courses = list(
+        await db.scalars(
+            update(Course)
+            .where(Course.author_id == id, Course.live())
+            .values(deleted_at=user.deleted_at)
+            .returning(Course.id)
+        )
+    )
     await db.commit()
+    # access tokens already issued stay valid until they expire; refresh
+    # tokens need the user row, so they die with it
+    await revocation_list.revoke(
+        db,
+        user_key(id),
+        datetime.now(UTC) + timedelta(minutes=settings.access_token_expire_minutes),
+    )
+    # their enrollments stop counting now, not when the purger removes them
+    for course_id in enrolled_in:
+        enrollment_counter.add(course_id, -1)
+    audit_log.record(
+        "user.delete", actor_id=request_actor(request), target_type="user", target_id=id
+    )
+    await response_cache.invalidate(COURSE_CACHE)
+    for course_id in deleted_courses:
+        await hub.publish(COURSE_TOPIC, "course.deleted", {"id": course_id})
@@ -5,6 +5,40 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.categories import Category
 from ..schemas.course import CreateCourseSchema, UpdateCourseSchema
 
+MAX_BATCH_IDS = 200
+
+
+def parse_id_list(ids: str, max_ids: int = MAX_BATCH_IDS) -> list[int]:
+    """Parse `?ids=3,1,2` into unique ids, keeping the requested order."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "ids must be a comma separated list of integers"},
+        )
+    unique = list(dict.fromkeys(parsed))
+    if not unique:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "ids must not be empty"},
+        )
+    if len(unique) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": f"At most {max_ids} ids per request"},
+        )
+    return unique
+
+
+def in_request_order(ids: list[int], rows: list) -> dict:
+    """Arrange fetched rows in the order their ids were requested."""
+    by_id = {row.id: row for row in rows}
+    return {
+        "items": [by_id[i] for i in ids if i in by_id],
+        "missing": [i for i in ids if i not in by_id],
+    }
+
 
 async def category_check(
     db: AsyncSession, new_course: UpdateCourseSchema | CreateCourseSchema
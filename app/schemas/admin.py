@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class CategoryCountSchema(BaseModel):
+    id: int
+    name: str
+    courses: int
+
+
+class TeacherCountSchema(BaseModel):
+    id: int
+    name: str
+    courses: int
+
+
+class DailyCountSchema(BaseModel):
+    day: str
+    courses: int
+
+
+class AdminStatsSchema(BaseModel):
+    generated_at: datetime
+    courses_per_category: list[CategoryCountSchema]
+    courses_per_teacher: list[TeacherCountSchema]
+    users_by_role: dict[str, int]
+    course_growth: list[DailyCountSchema]
+
+
+class AllocationDiffSchema(BaseModel):
+    file: str
+    line: int
+    size_diff: int
+    size: int
+    count_diff: int
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -16,6 +18,11 @@ class ReadCourseSchema(CourseBaseSchema):
         from_attributes = True
 
 
+class CourseBatchSchema(BaseModel):
+    items: list[ReadCourseSchema]
+    missing: list[int]
+
+
 class CreateCourseSchema(CourseBaseSchema):
     category: str
 
@@ -25,3 +32,16 @@ class UpdateCourseSchema(BaseModel):
     description: str | None = None
     video_id: str | None = None
     category: str | None = None
+
+
+class PopularCourseSchema(BaseModel):
+    id: int
+    title: str
+    category_id: int
+    view_count: int
+
+
+class LeaderboardSchema(BaseModel):
+    generated_at: datetime | None
+    category_id: int | None = None
+    courses: list[PopularCourseSchema]
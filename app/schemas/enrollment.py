@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+from .course import ReadCourseSchema
+from .user import UserReadSchema
+
+T = TypeVar("T")
+
+
+class EnrollmentReadSchema(BaseModel):
+    user_id: int
+    course_id: int
+    enrolled_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class KeysetPage(BaseModel, Generic[T]):
+    items: list[T]
+    # pass as `after` to fetch the next page; None on the last page
+    next_after: int | None = None
+
+
+class MyCoursesPage(KeysetPage[ReadCourseSchema]):
+    pass
+
+
+class RosterPage(KeysetPage[UserReadSchema]):
+    course_id: int
+    enrollment_count: int
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ProgressUpdateSchema(BaseModel):
+    position_seconds: int = Field(ge=0)
+
+
+class ProgressReadSchema(BaseModel):
+    course_id: int
+    position_seconds: int
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
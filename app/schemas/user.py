@@ -58,6 +58,11 @@ class UserReadSchema(UserBaseSchema):
     id: int
 
 
+class UserBatchSchema(BaseModel):
+    items: list[UserReadSchema]
+    missing: list[int]
+
+
 class UserLoginSchema(BaseModel):
     email: EmailStr
     password: str
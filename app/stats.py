@@ -0,0 +1,70 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .coalesce import SingleFlight
+from .database import AsyncSessionLocal
+from .models.categories import Category
+from .models.courses import Course
+from .models.users import User
+
+
+class StatsSnapshot:
+    """Admin analytics, materialized by a few GROUP BY queries.
+
+    Refreshed in the background; requests are served from memory together
+    with `generated_at` so callers can judge freshness.
+    """
+
+    def __init__(self) -> None:
+        self.generated_at: datetime | None = None
+        self.data: dict = {}
+        self._refresh = SingleFlight()
+
+    async def refresh(self, db: AsyncSession) -> None:
+        per_category = await db.execute(
+            select(Category.id, Category.name, func.count(Course.id).label("courses"))
+            .outerjoin(Course, Course.category_id == Category.id)
+            .group_by(Category.id, Category.name)
+            .order_by(Category.id)
+        )
+        per_teacher = await db.execute(
+            select(User.id, User.name, func.count(Course.id).label("courses"))
+            .join(Course, Course.author_id == User.id)
+            .group_by(User.id, User.name)
+            .order_by(User.id)
+        )
+        by_role = await db.execute(
+            select(User.role, func.count(User.id)).group_by(User.role)
+        )
+        day = func.date(Course.created_date).label("day")
+        growth = await db.execute(
+            select(day, func.count(Course.id).label("courses"))
+            .group_by(day)
+            .order_by(day)
+        )
+
+        self.data = {
+            "courses_per_category": [dict(row) for row in per_category.mappings()],
+            "courses_per_teacher": [dict(row) for row in per_teacher.mappings()],
+            "users_by_role": dict(by_role.tuples().all()),
+            # the driver returns a date (PostgreSQL) or a string (SQLite)
+            "course_growth": [
+                {"day": str(row.day), "courses": row.courses} for row in growth
+            ],
+        }
+        self.generated_at = datetime.now(UTC)
+
+    async def ensure_fresh(self) -> None:
+        """Compute once on demand if the background refresh has not run yet."""
+        if self.generated_at is None:
+            await self._refresh.do("stats", refresh_stats)
+
+
+stats_snapshot = StatsSnapshot()
+
+
+async def refresh_stats() -> None:
+    async with AsyncSessionLocal() as db:
+        await stats_snapshot.refresh(db)
@@ -0,0 +1,122 @@
+"""Warm a fresh worker up before it takes traffic.
+
+Started from the lifespan, in the background so the server can answer
+`/ready` (503 until done) meanwhile:
+
+1. open `warmup_connections` pool connections at once, so the first burst
+   doesn't pay for connection setup, and run the hot read queries on each
+   of them to fill their prepared-statement caches;
+2. send the hot reads (`warmup_paths`) through the app itself, once per
+   role in `warmup_roles`, as a short-lived synthetic user. That compiles
+   SQLAlchemy's statement cache and Pydantic's serializers and fills the
+   response cache under the same keys real requests use.
+
+Warm-up is best effort: a failure is logged and the worker reports ready
+anyway, since a cold worker beats one that never serves.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from . import database
+from .auth.utilits import issue_token
+from .env_loader import settings
+from .models.courses import Course
+from .readpath import CATEGORY_COLUMNS, COURSE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def hot_queries() -> list:
+    """The statements behind the busiest reads, as the routers build them."""
+    courses = select(*COURSE_COLUMNS).where(Course.live())
+    return [
+        select(*CATEGORY_COLUMNS),
+        select(func.count()).select_from(courses.subquery()),
+        courses.limit(50).offset(0),
+    ]
+
+
+async def open_connections(engine: AsyncEngine, count: int) -> int:
+    """Check out `count` connections together, prime them, return them to the pool."""
+    capacity = getattr(engine.pool, "size", lambda: count)()
+    count = min(count, capacity)
+    conns = await asyncio.gather(*(engine.connect() for _ in range(count)))
+    try:
+        for conn in conns:
+            for query in hot_queries():
+                await conn.execute(query)
+            await conn.rollback()
+    finally:
+        for conn in conns:
+            await conn.close()
+    return count
+
+
+def warmup_token(role: str) -> str:
+    return issue_token(
+        {"sub": f"warmup-{role}", "id": f"warmup-{role}", "role": role},
+        timedelta(minutes=1),
+    )
+
+
+class WarmUp:
+    def __init__(self) -> None:
+        self.ready = False
+        self.report: dict = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self, app: FastAPI) -> None:
+        if self._task is None:
+            self.ready = False
+            self._task = asyncio.create_task(self.run(app), name="warm-up")
+
+    async def stop(self) -> None:
+        # stop reporting ready first, so the load balancer drains this worker
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self, app: FastAPI) -> None:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(settings.warmup_timeout_seconds):
+                await self.warm(app)
+        except Exception:
+            logger.exception("warm-up failed; reporting ready anyway")
+        self.report["seconds"] = round(time.perf_counter() - started, 3)
+        self.ready = True
+        logger.info("warm-up done", extra={"warmup": self.report})
+
+    async def warm(self, app: FastAPI) -> None:
+        engines = {"writer": database.engine}
+        if database.read_engine is not None:
+            engines["reader"] = database.read_engine
+        self.report["connections"] = {
+            name: await open_connections(engine, settings.warmup_connections)
+            for name, engine in engines.items()
+        }
+
+        statuses: dict[str, int] = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://warmup"
+        ) as client:
+            for role in settings.warmup_roles:
+                client.cookies.set("access_token", warmup_token(role))
+                for path in settings.warmup_paths:
+                    response = await client.get(path)
+                    statuses[f"{role} {path}"] = response.status_code
+        self.report["requests"] = statuses
+
+
+warm_up = WarmUp()
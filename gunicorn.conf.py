@@ -0,0 +1,42 @@
+"""Production server: `gunicorn -c gunicorn.conf.py` (needs the `prod` extra).
+
+The app is imported once in the master (`preload_app`) and forked, so workers
+start without re-importing and share the imported code pages. Each worker
+runs its own event loop (uvloop) and HTTP parser (httptools); the lifespan
+gives every worker a fresh connection pool after the fork.
+"""
+
+import gc
+import os
+
+from uvicorn.workers import UvicornWorker
+
+
+class Worker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+wsgi_app = "app.main:create_app()"
+worker_class = Worker
+preload_app = True
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# one event loop per core; set WEB_CONCURRENCY to override
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+# leave time for the lifespan shutdown to flush write-behind buffers
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
+# recycle workers now and then so slow leaks can't accumulate
+max_requests = 10_000
+max_requests_jitter = 1_000
+
+# the app writes its own JSON access log (app/logs.py)
+accesslog = None
+errorlog = "-"
+
+
+def pre_fork(_server, _worker) -> None:  # noqa: ANN001
+    # move everything imported so far out of the collector's reach: a gc
+    # pass in a worker would otherwise write to (and un-share) those pages
+    gc.freeze()
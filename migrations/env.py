@@ -2,19 +2,30 @@ from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import engine_from_config, pool
+from sqlalchemy.engine import make_url
 
 from app.database import Base
 from app.env_loader import settings
+from app.models.audit import AuditEvent
 from app.models.categories import Category
 from app.models.courses import Course
+from app.models.enrollments import Enrollment
+from app.models.progress import WatchProgress
+from app.models.tokens import RevokedToken
 from app.models.users import User
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-sync_url = settings.postgresql_url.replace("postgresql+asyncpg://", "postgresql://")
-config.set_main_option("sqlalchemy.url", sync_url)
+# alembic runs synchronously: swap the async driver (asyncpg, aiosqlite) for
+# the dialect's default one
+url = make_url(settings.postgresql_url)
+sync_url = url.set(drivername=url.get_backend_name())
+# "%" would be read as configparser interpolation
+config.set_main_option(
+    "sqlalchemy.url", sync_url.render_as_string(hide_password=False).replace("%", "%%")
+)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -51,6 +62,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -71,7 +83,22 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        if connection.dialect.name == "postgresql":
+            # DDL waiting on a lock blocks every query queued behind it: give up
+            # quickly and rerun rather than stall the application
+            connection.exec_driver_sql(
+                f"SET lock_timeout = {settings.migration_lock_timeout_ms}"
+            )
+            connection.commit()
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # one transaction per migration, so the autocommit blocks used by
+            # app.online_migrations only commit that migration's work
+            transaction_per_migration=True,
+            # SQLite can't ALTER most things in place; batch mode rebuilds the table
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,31 @@
+"""add course view count
+
+Revision ID: 7b8e2f4c6d15
+Revises: 3c1d0e7a9b42
+Create Date: 2026-10-19 10:48:05.774931
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b8e2f4c6d15"
+down_revision: Union[str, Sequence[str], None] = "3c1d0e7a9b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "course",
+        sa.Column("view_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("course", "view_count")
@@ -0,0 +1,48 @@
+"""add enrollment
+
+Revision ID: 952352e274cb
+Revises: 5f3e10b8d176
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "952352e274cb"
+down_revision: Union[str, Sequence[str], None] = "5f3e10b8d176"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "enrollment",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("course_id", sa.Integer(), nullable=False),
+        sa.Column("enrolled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["course_id"], ["course.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "course_id"),
+    )
+    op.create_index(
+        "ix_enrollment_course_id_user_id",
+        "enrollment",
+        ["course_id", "user_id"],
+        unique=False,
+    )
+    op.add_column(
+        "course",
+        sa.Column("enrollment_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("course", "enrollment_count")
+    op.drop_index("ix_enrollment_course_id_user_id", table_name="enrollment")
+    op.drop_table("enrollment")
@@ -0,0 +1,46 @@
+"""add audit event
+
+Revision ID: a41f9c3e8d27
+Revises: 7b8e2f4c6d15
+Create Date: 2026-10-19 11:36:52.118430
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a41f9c3e8d27"
+down_revision: Union[str, Sequence[str], None] = "7b8e2f4c6d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "audit_event",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=True),
+        sa.Column("target_type", sa.String(length=30), nullable=True),
+        sa.Column("target_id", sa.Integer(), nullable=True),
+        sa.Column("detail", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_audit_event_action"), "audit_event", ["action"], unique=False
+    )
+    op.create_index(
+        op.f("ix_audit_event_created_at"), "audit_event", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_audit_event_created_at"), table_name="audit_event")
+    op.drop_index(op.f("ix_audit_event_action"), table_name="audit_event")
+    op.drop_table("audit_event")
@@ -0,0 +1,40 @@
+"""add revoked token
+
+Revision ID: c5e2a7d913f0
+Revises: a41f9c3e8d27
+Create Date: 2026-10-19 13:12:40.671903
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e2a7d913f0"
+down_revision: Union[str, Sequence[str], None] = "a41f9c3e8d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "revoked_token",
+        sa.Column("jti", sa.String(length=36), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(
+        op.f("ix_revoked_token_expires_at"),
+        "revoked_token",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_revoked_token_expires_at"), table_name="revoked_token")
+    op.drop_table("revoked_token")
@@ -0,0 +1,83 @@
+"""add soft delete
+
+Revision ID: d71b3f8a2c94
+Revises: c5e2a7d913f0
+Create Date: 2026-10-19 15:02:11.408215
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.models.soft_delete import DELETED, LIVE
+from app.online_migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "d71b3f8a2c94"
+down_revision: Union[str, Sequence[str], None] = "c5e2a7d913f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # nullable, no default: a catalog-only change, no table rewrite
+    op.add_column(
+        "course", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "user", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    create_index_concurrently(
+        "ix_course_author_id_live",
+        "course",
+        ["author_id"],
+        postgresql_where=LIVE,
+        sqlite_where=LIVE,
+    )
+    create_index_concurrently(
+        "ix_course_category_id_live",
+        "course",
+        ["category_id"],
+        postgresql_where=LIVE,
+        sqlite_where=LIVE,
+    )
+    create_index_concurrently(
+        "ix_course_deleted_at",
+        "course",
+        ["deleted_at"],
+        postgresql_where=DELETED,
+        sqlite_where=DELETED,
+    )
+    # emails stay unique among live users only
+    create_index_concurrently(
+        "uq_user_email_live",
+        "user",
+        ["email"],
+        unique=True,
+        postgresql_where=LIVE,
+        sqlite_where=LIVE,
+    )
+    drop_index_concurrently("ix_user_email", "user")
+    create_index_concurrently(
+        "ix_user_deleted_at",
+        "user",
+        ["deleted_at"],
+        postgresql_where=DELETED,
+        sqlite_where=DELETED,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently("ix_user_deleted_at", "user")
+    # fails while a deleted account and a live one share an email
+    create_index_concurrently("ix_user_email", "user", ["email"], unique=True)
+    drop_index_concurrently("uq_user_email_live", "user")
+    drop_index_concurrently("ix_course_deleted_at", "course")
+    drop_index_concurrently("ix_course_category_id_live", "course")
+    drop_index_concurrently("ix_course_author_id_live", "course")
+    op.drop_column("user", "deleted_at")
+    op.drop_column("course", "deleted_at")
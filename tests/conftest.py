@@ -10,6 +10,8 @@ test_env = {
     "ALGORITHM": "HS256",
     "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
     "ADMIN_EMAIL": "admin@example.com",
+    # the test client talks plain HTTP
+    "COOKIE_SECURE": "false",
 }
 for key, value in test_env.items():
     os.environ.setdefault(key, value)
@@ -19,8 +21,13 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from app.auth.utilits import create_access_token
+from app.cache import response_cache
 from app.database import Base, get_db
+from app.env_loader import settings
+from app.limiter import limiter
 from app.main import app
+from app.models.users import User
 
 # module-level in-memory async engine and session factory used by tests
 test_engine = create_async_engine(
@@ -33,6 +40,14 @@ TestSession = async_sessionmaker(
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> None:
+    # limiter storage is process-wide; don't let earlier tests eat the budget
+    limiter.reset()
+    # cached pages would outlive the per-test database
+    response_cache.clear()
+
+
 @pytest.fixture(name="session")
 async def session_fixture() -> AsyncSession:  # type: ignore
     # recreate schema at start of each test to isolate state
@@ -48,10 +63,8 @@ async def session_fixture() -> AsyncSession:  # type: ignore
 async def client_fixture(session: AsyncSession) -> AsyncClient:  # type: ignore
     # ensure the app uses our test engine for lifespan and dependencies
     import app.database as _database
-    import app.main as _main
 
     _database.engine = test_engine
-    _main.engine = test_engine
 
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
         async with TestSession() as s:
@@ -68,3 +81,46 @@ async def client_fixture(session: AsyncSession) -> AsyncClient:  # type: ignore
         yield client  # type: ignore
 
     app.dependency_overrides.clear()
+
+
+def auth_headers(user: User) -> dict[str, str]:
+    """Cookie header for `user`, with the claims a real login puts in the token."""
+    token = create_access_token(
+        data={
+            "sub": user.email,
+            "role": user.role,
+            "id": str(user.id),
+            "name": user.name,
+        },
+        secret_key=settings.secret_key,
+        algorithm=settings.algorithm,
+    )
+    return {"Cookie": f"access_token={token}"}
+
+
+async def make_user(session: AsyncSession, role: str) -> User:
+    user = User(
+        name=role.title(),
+        bio="",
+        email=f"{role}@example.com",
+        role=role,
+        hashed_password="pw",
+    )
+    session.add(user)
+    await session.commit()
+    return user
+
+
+@pytest.fixture
+async def admin_headers(session: AsyncSession) -> dict[str, str]:
+    return auth_headers(await make_user(session, "admin"))
+
+
+@pytest.fixture
+async def teacher_headers(session: AsyncSession) -> dict[str, str]:
+    return auth_headers(await make_user(session, "teacher"))
+
+
+@pytest.fixture
+async def student_headers(session: AsyncSession) -> dict[str, str]:
+    return auth_headers(await make_user(session, "student"))
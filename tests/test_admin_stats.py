@@ -0,0 +1,76 @@
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.users import User
+from app.stats import stats_snapshot
+
+
+@pytest.fixture
+async def users(session: AsyncSession) -> dict[str, User]:
+    admin = User(
+        name="Admin",
+        bio="",
+        email="admin@example.com",
+        role="admin",
+        hashed_password="pw",
+    )
+    teacher = User(
+        name="Teacher",
+        bio="",
+        email="teacher@example.com",
+        role="teacher",
+        hashed_password="pw",
+    )
+    student = User(
+        name="Student",
+        bio="",
+        email="student@example.com",
+        role="student",
+        hashed_password="pw",
+    )
+    math, art = Category(name="math"), Category(name="art")
+    session.add_all([admin, teacher, student, math, art])
+    await session.commit()
+    session.add_all(
+        Course(
+            title=title,
+            description="Desc",
+            video_id=title,
+            category_id=math.id,
+            author_id=teacher.id,
+        )
+        for title in ("algebra", "geometry")
+    )
+    await session.commit()
+    return {"admin": admin, "student": student}
+
+
+@pytest.mark.asyncio
+async def test_stats_snapshot(
+    client: AsyncClient, session: AsyncSession, users: dict[str, User]
+) -> None:
+    await stats_snapshot.refresh(session)
+
+    response = await client.get("/admin/stats", headers=auth_headers(users["admin"]))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["generated_at"] is not None
+    assert body["users_by_role"] == {"admin": 1, "teacher": 1, "student": 1}
+    assert [(c["name"], c["courses"]) for c in body["courses_per_category"]] == [
+        ("math", 2),
+        ("art", 0),
+    ]
+    assert body["courses_per_teacher"][0]["courses"] == 2
+    assert sum(day["courses"] for day in body["course_growth"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_admin_only(
+    client: AsyncClient, session: AsyncSession, users: dict[str, User]
+) -> None:
+    response = await client.get("/admin/stats", headers=auth_headers(users["student"]))
+    assert response.status_code == 403
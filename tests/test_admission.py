@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.admission import AdaptiveLimit, AdmissionControlMiddleware
+
+
+def build_app(release: asyncio.Event) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow() -> dict:
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/courses/")
+    async def courses() -> dict:
+        return {"ok": True}
+
+    @app.post("/auth/login")
+    async def login() -> dict:
+        return {"ok": True}
+
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        initial_limit=4,
+        min_limit=1,
+        max_limit=8,
+        latency_target_ms=1000,
+        retry_after_seconds=2,
+    )
+    return app
+
+
+@pytest.mark.asyncio
+async def test_bulk_reads_shed_before_login() -> None:
+    release = asyncio.Event()
+    app = build_app(release)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        # 3 in flight: above the bulk-read share (0.7 * 4) but below the limit
+        pending = [asyncio.create_task(client.get("/slow")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+
+        shed = await client.get("/courses/")
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "2"
+
+        login = await client.post("/auth/login")
+        assert login.status_code == 200
+
+        release.set()
+        assert all(r.status_code == 200 for r in await asyncio.gather(*pending))
+
+        assert (await client.get("/courses/")).status_code == 200
+
+
+def test_adaptive_limit_aimd() -> None:
+    limit = AdaptiveLimit(initial=10, min_limit=2, max_limit=11, latency_target=0.1)
+
+    limit.on_sample(latency=0.01, inflight=10)
+    assert limit.limit == pytest.approx(10.1)
+
+    limit.on_sample(latency=0.5, inflight=10)
+    assert limit.limit == pytest.approx(9.09)
+
+    # a second slow sample inside the same interval does not decrease again
+    limit.on_sample(latency=0.5, inflight=10)
+    assert limit.limit == pytest.approx(9.09)
+
+    # idle workers do not inflate the limit
+    limit.on_sample(latency=0.01, inflight=1)
+    assert limit.limit == pytest.approx(9.09)
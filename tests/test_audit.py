@@ -0,0 +1,52 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.audit import AuditLog, audit_log
+from app.models.audit import AuditEvent
+
+
+@pytest.fixture(autouse=True)
+def drain_audit_log() -> None:
+    # the queue is process-wide; don't see events from earlier tests
+    audit_log.take_batch()
+
+
+@pytest.mark.asyncio
+async def test_record_never_blocks_when_full() -> None:
+    log = AuditLog(max_queue=2, batch_size=10, flush_interval=60)
+    for i in range(5):
+        log.record("course.create", actor_id=1, target_type="course", target_id=i)
+
+    assert len(log) == 2
+    assert log.dropped == 3
+
+
+@pytest.mark.asyncio
+async def test_write_drains_in_batches(session: AsyncSession) -> None:
+    log = AuditLog(max_queue=100, batch_size=2, flush_interval=60)
+    for i in range(5):
+        log.record("course.create", actor_id="1", target_type="course", target_id=i)
+
+    assert await log.write(session) == 5
+    assert len(log) == 0
+    events = (await session.execute(select(AuditEvent))).scalars().all()
+    assert [e.target_id for e in events] == [0, 1, 2, 3, 4]
+    assert events[0].actor_id == 1
+
+
+@pytest.mark.asyncio
+async def test_category_admin_actions_are_audited(
+    client: AsyncClient, session: AsyncSession, admin_headers: dict[str, str]
+) -> None:
+    response = await client.post(
+        "/categories/", json={"name": "Audited"}, headers=admin_headers
+    )
+    assert response.status_code == 201
+
+    await audit_log.write(session)
+    event = (await session.execute(select(AuditEvent))).scalar_one()
+    assert event.action == "category.create"
+    assert event.target_type == "category"
+    assert event.detail == {"name": "audited"}
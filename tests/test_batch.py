@@ -0,0 +1,92 @@
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.users import User
+
+
+@pytest.fixture
+async def data(session: AsyncSession) -> dict:
+    admin = User(
+        name="Admin",
+        bio="",
+        email="admin@example.com",
+        role="admin",
+        hashed_password="pw",
+    )
+    teacher = User(
+        name="Teacher",
+        bio="",
+        email="teacher@example.com",
+        role="teacher",
+        hashed_password="pw",
+    )
+    category = Category(name="math")
+    session.add_all([admin, teacher, category])
+    await session.commit()
+    courses = [
+        Course(
+            title=f"Course {i}",
+            description="Desc",
+            video_id=f"v{i}",
+            category_id=category.id,
+            author_id=teacher.id,
+        )
+        for i in range(3)
+    ]
+    session.add_all(courses)
+    await session.commit()
+    return {"admin": admin, "teacher": teacher, "courses": courses}
+
+
+@pytest.mark.asyncio
+async def test_courses_batch_in_request_order(
+    client: AsyncClient, session: AsyncSession, data: dict
+) -> None:
+    first, second, third = (c.id for c in data["courses"])
+    response = await client.get(
+        f"/courses/batch?ids={third},9999,{first},{third}",
+        headers=auth_headers(data["teacher"]),
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [c["id"] for c in body["items"]] == [third, first]
+    assert body["missing"] == [9999]
+
+
+@pytest.mark.asyncio
+async def test_courses_batch_rejects_bad_ids(
+    client: AsyncClient, session: AsyncSession, data: dict
+) -> None:
+    headers = auth_headers(data["teacher"])
+    response = await client.get("/courses/batch?ids=1,abc", headers=headers)
+    assert response.status_code == 400
+
+    too_many = ",".join(str(i) for i in range(201))
+    response = await client.get(f"/courses/batch?ids={too_many}", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_users_batch_admin_only(
+    client: AsyncClient, session: AsyncSession, data: dict
+) -> None:
+    ids = f"{data['teacher'].id},{data['admin'].id},42"
+    response = await client.get(
+        f"/users/batch?ids={ids}", headers=auth_headers(data["admin"])
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [u["email"] for u in body["items"]] == [
+        "teacher@example.com",
+        "admin@example.com",
+    ]
+    assert body["missing"] == [42]
+
+    response = await client.get(
+        f"/users/batch?ids={ids}", headers=auth_headers(data["teacher"])
+    )
+    assert response.status_code == 403
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from app.benchmarks import Result, cases, compare, load, measure, save
+
+
+def test_measure_reports_rate_and_allocations() -> None:
+    result = measure(
+        "alloc", lambda: bytearray(4096), repeat=3, min_time=0.001, warmup=0
+    )
+
+    assert result.rounds == 3
+    assert result.loops >= 1
+    assert result.ops_per_sec > 0
+    assert result.alloc_peak_bytes >= 4096
+    assert result.retained_bytes < 4096  # freed after each call
+
+
+def test_every_case_runs() -> None:
+    for func in cases().values():
+        func()
+
+
+def test_compare_flags_slowdowns_over_threshold(tmp_path: Path) -> None:
+    def result(name: str, ops: float) -> Result:
+        return Result(name, ops, 1e9 / ops, 1.0, 3, 1, 0, 0.0)
+
+    path = tmp_path / "baseline.json"
+    save(path, [result("fast", 1000), result("slow", 1000), result("gone", 10)])
+
+    changes = compare(
+        [result("fast", 1200), result("slow", 850), result("new", 5)],
+        load(path),
+        threshold_pct=10,
+    )
+
+    assert [
+        (name, round(change), regressed) for name, change, regressed in changes
+    ] == [
+        ("fast", 20, False),
+        ("slow", -15, True),
+    ]
@@ -0,0 +1,164 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.broadcast import (
+    BroadcastHub,
+    LocalBackend,
+    PostgresNotifyBackend,
+    format_sse,
+    hub,
+)
+from app.models.categories import Category
+from app.models.courses import Course
+from app.routers.course import COURSE_TOPIC
+
+
+@pytest.mark.asyncio
+async def test_hub_fans_out_through_backend() -> None:
+    local_hub = BroadcastHub(LocalBackend(), buffer_size=10)
+    await local_hub.start()
+    first = local_hub.subscribe("courses")
+    second = local_hub.subscribe("courses")
+    other = local_hub.subscribe("users")
+
+    await local_hub.publish("courses", "course.created", {"id": 1})
+
+    expected = {"event": "course.created", "data": {"id": 1}}
+    assert first.queue.get_nowait() == expected
+    assert second.queue.get_nowait() == expected
+    assert other.queue.empty()
+
+    local_hub.unsubscribe(first)
+    assert local_hub.subscriber_count("courses") == 1
+    await local_hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_subscription_buffer_drops_oldest() -> None:
+    local_hub = BroadcastHub(LocalBackend(), buffer_size=2)
+    subscription = local_hub.subscribe("courses")
+    for i in range(5):
+        local_hub.dispatch("courses", {"event": "course.created", "data": {"id": i}})
+
+    assert subscription.dropped == 3
+    assert subscription.queue.get_nowait()["data"] == {"id": 3}
+    assert subscription.queue.get_nowait()["data"] == {"id": 4}
+
+
+class ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_subscribes_only_while_streaming() -> None:
+    local_hub = BroadcastHub(LocalBackend())
+
+    # a client gone before the body started never runs the generator
+    never_started = local_hub.sse_stream(ConnectedRequest(), "courses")
+    assert local_hub.subscriber_count("courses") == 0
+    await never_started.aclose()
+
+    stream = local_hub.sse_stream(ConnectedRequest(), "courses", heartbeat=0.01)
+    assert await anext(stream) == ": keep-alive\n\n"
+    assert local_hub.subscriber_count("courses") == 1
+    await stream.aclose()
+    assert local_hub.subscriber_count("courses") == 0
+
+
+def test_format_sse() -> None:
+    assert format_sse("course.deleted", {"id": 7}) == (
+        'event: course.deleted\ndata: {"id": 7}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_course_publishes_event(
+    client: AsyncClient, session: AsyncSession, teacher_headers: dict[str, str]
+) -> None:
+    session.add(Category(name="Programming"))
+    await session.commit()
+    subscription = hub.subscribe(COURSE_TOPIC)
+    try:
+        response = await client.post(
+            "/courses/",
+            json={
+                "title": "Live",
+                "description": "Desc",
+                "video_id": "vid",
+                "category": "Programming",
+            },
+            headers=teacher_headers,
+        )
+        assert response.status_code == 201
+
+        course_id = await session.scalar(
+            select(Course.id).where(Course.title == "Live")
+        )
+        message = subscription.queue.get_nowait()
+        assert message == {"event": "course.created", "data": {"id": course_id}}
+    finally:
+        hub.unsubscribe(subscription)
+
+
+class FailingBackend(LocalBackend):
+    async def publish(self, topic: str, message: dict) -> None:
+        raise ConnectionError("fan-out is down")
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_is_logged_not_raised(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    failing_hub = BroadcastHub(FailingBackend())
+    await failing_hub.start()
+
+    assert await failing_hub.publish("courses", "course.created", {"id": 1}) is False
+    assert "broadcast publish failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_notify_rejects_oversized_payload() -> None:
+    with pytest.raises(ValueError, match="too large"):
+        await PostgresNotifyBackend().publish("courses", {"data": "x" * 8000})
+
+
+class FlakyNotifyBackend(PostgresNotifyBackend):
+    """LISTEN that fails `failures` times before it connects."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__(retry_initial=0.001, retry_max=0.004)
+        self.failures = failures
+        self.attempts = 0
+
+    async def _listen(self) -> None:
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise OSError("connection refused")
+
+
+@pytest.mark.asyncio
+async def test_notify_listener_reconnects_after_connection_loss() -> None:
+    backend = FlakyNotifyBackend(failures=0)
+    await backend.start(lambda topic, message: None)
+    # the first connect went through; the next three are refused
+    backend.failures = 4
+
+    backend._on_terminated(None)
+    reconnect = backend._reconnect
+    assert reconnect is not None
+    backend._on_terminated(None)
+    assert backend._reconnect is reconnect
+    await reconnect
+    assert backend.attempts == 5
+    assert backend._reconnect is None
+
+    # stopping while a reconnect is pending cancels it
+    backend.failures = 100
+    backend._on_terminated(None)
+    await backend.stop()
+    assert backend._reconnect is None
+    backend._on_terminated(None)
+    assert backend._reconnect is None
@@ -0,0 +1,199 @@
+import asyncio
+
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.broadcast import BroadcastHub, LocalBackend
+from app.cache import (
+    CACHE_TOPIC,
+    LocalCacheBackend,
+    RespCacheBackend,
+    RespError,
+    ResponseCache,
+)
+from app.models.categories import Category
+from app.models.users import User
+
+
+def make_cache(l2: object = None, **kwargs: object) -> ResponseCache:
+    options = {"max_entries": 100, "ttls": {}, "default_ttl": 60.0}
+    options.update(kwargs)
+    return ResponseCache(l2, **options)  # type: ignore[arg-type]
+
+
+class Loader:
+    def __init__(self, value: bytes = b"v") -> None:
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self) -> bytes:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_misses_share_one_load_and_hits_skip_it() -> None:
+    cache = make_cache()
+    load = Loader()
+    bodies = await asyncio.gather(
+        *(cache.get_or_load("courses", "page1", load) for _ in range(5))
+    )
+    assert load.calls == 1
+    assert all(body is bodies[0] for body in bodies)
+    assert (await cache.get_or_load("courses", "page1", load)).raw == b"v"
+    assert load.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_namespace_ttl_and_lru_bound() -> None:
+    cache = make_cache(max_entries=2, ttls={"live": 0.0})
+    load = Loader()
+    await cache.get_or_load("live", "a", load)
+    await cache.get_or_load("live", "a", load)
+    assert load.calls == 2  # expired immediately
+
+    for key in ("a", "b", "c"):
+        await cache.get_or_load("courses", key, load)
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers() -> None:
+    hub = BroadcastHub(LocalBackend())
+    await hub.start()
+    shared = LocalCacheBackend()
+    first = make_cache(shared, broadcast=hub)
+    second = make_cache(shared, broadcast=hub)
+    for cache in (first, second):
+        hub.add_listener(CACHE_TOPIC, cache.on_message)
+
+    load = Loader(b"old")
+    await first.get_or_load("courses", "page1", load)
+    # the second worker is served from the shared tier
+    assert (await second.get_or_load("courses", "page1", load)).raw == b"old"
+    assert load.calls == 1
+
+    await first.invalidate("courses")
+    load.value = b"new"
+    assert (await second.get_or_load("courses", "page1", load)).raw == b"new"
+    assert (await first.get_or_load("courses", "page1", load)).raw == b"new"
+    assert load.calls == 2
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_local_hub_rereads_generation_from_l2() -> None:
+    shared = LocalCacheBackend()
+    # one worker each, and nothing carries messages between them
+    first = make_cache(shared, broadcast=BroadcastHub(LocalBackend()))
+    second = make_cache(shared, broadcast=BroadcastHub(LocalBackend()))
+
+    load = Loader(b"old")
+    await second.get_or_load("courses", "page1", load)
+    await first.invalidate("courses")
+    load.value = b"new"
+    assert (await second.get_or_load("courses", "page1", load)).raw == b"new"
+    assert load.calls == 2
+
+
+def fake_resp_server(store: dict[bytes, bytes]):  # noqa: ANN201
+    """Just enough of a Redis server for GET, SET and INCR."""
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        while True:
+            try:
+                command, *args = await RespCacheBackend.read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                break
+            if command == b"GET":
+                value = store.get(args[0])
+                if value is None:
+                    reply = b"$-1\r\n"
+                else:
+                    reply = b"$%d\r\n%s\r\n" % (len(value), value)
+            elif command == b"SET":
+                store[args[0]] = args[1]
+                reply = b"+OK\r\n"
+            elif command == b"INCR":
+                value = int(store.get(args[0], b"0")) + 1
+                store[args[0]] = str(value).encode()
+                reply = b":%d\r\n" % value
+            else:
+                reply = b"-ERR unknown command\r\n"
+            writer.write(reply)
+            await writer.drain()
+        writer.close()
+
+    return handle
+
+
+@pytest.mark.asyncio
+async def test_resp_backend_round_trip() -> None:
+    server = await asyncio.start_server(fake_resp_server({}), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    backend = RespCacheBackend(f"redis://127.0.0.1:{port}/0", pool_size=2)
+    try:
+        assert await backend.get("missing") is None
+        await backend.set("key", b"\x00body\r\n", ttl=5)
+        assert await backend.get("key") == b"\x00body\r\n"
+        assert await backend.incr("gen") == 1
+        assert await backend.incr("gen") == 2
+        with pytest.raises(RespError):
+            await backend.command("FLUSHALL")
+    finally:
+        await backend.close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_l2_falls_back_to_load() -> None:
+    server = await asyncio.start_server(fake_resp_server({}), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+    cache = make_cache(RespCacheBackend(f"redis://127.0.0.1:{port}"))
+    load = Loader()
+    assert (await cache.get_or_load("courses", "page1", load)).raw == b"v"
+    await cache.invalidate("courses")
+    await cache.get_or_load("courses", "page1", load)
+    assert load.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_category_list_is_cached_until_a_write(
+    client: AsyncClient, session: AsyncSession
+) -> None:
+    admin = User(
+        name="Admin",
+        bio="",
+        email="admin@example.com",
+        role="admin",
+        hashed_password="pw",
+    )
+    session.add_all([admin, Category(name="math")])
+    await session.commit()
+    headers = auth_headers(admin)
+
+    response = await client.get("/categories/", headers=headers)
+    assert response.json() == {"category": [{"name": "math"}]}
+
+    # written behind the API's back: still served from cache
+    session.add(Category(name="art"))
+    await session.commit()
+    response = await client.get("/categories/", headers=headers)
+    assert response.json() == {"category": [{"name": "math"}]}
+
+    response = await client.post(
+        "/categories/", json={"name": "music"}, headers=headers
+    )
+    assert response.status_code == 201
+    response = await client.get("/categories/", headers=headers)
+    names = [c["name"] for c in response.json()["category"]]
+    assert names == ["math", "art", "music"]
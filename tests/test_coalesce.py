@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.coalesce import SingleFlight
+from app.models.categories import Category
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_inflight_call() -> None:
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def load() -> bytes:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"result"
+
+    waiters = [asyncio.create_task(flight.do("key", load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert results == [b"result"] * 10
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_and_forgets_key() -> None:
+    flight = SingleFlight()
+
+    async def fail() -> bytes:
+        raise RuntimeError("boom")
+
+    async def load() -> bytes:
+        return b"ok"
+
+    with pytest.raises(RuntimeError):
+        await flight.do("key", fail)
+    assert await flight.do("key", load) == b"ok"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_follower_takes_over_cancelled_leader() -> None:
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def hang() -> bytes:
+        started.set()
+        await asyncio.Event().wait()
+        return b"never"
+
+    async def load() -> bytes:
+        return b"ok"
+
+    leader = asyncio.create_task(flight.do("key", hang))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == b"ok"
+
+
+@pytest.mark.asyncio
+async def test_get_categories_coalesced(
+    client: AsyncClient, session: AsyncSession, student_headers: dict[str, str]
+) -> None:
+    session.add(Category(name="math"))
+    await session.commit()
+    loads = 0
+
+    def count_loads(
+        conn: object, cursor: object, statement: str, *args: object
+    ) -> None:
+        nonlocal loads
+        if "FROM category" in statement:
+            loads += 1
+            time.sleep(0.05)  # hold the query so the other requests pile up
+
+    engine = database.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count_loads)
+    try:
+        responses = await asyncio.gather(
+            *(client.get("/categories/", headers=student_headers) for _ in range(3))
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count_loads)
+
+    assert loads == 1
+    for response in responses:
+        assert response.status_code == 302
+        assert response.json() == {"category": [{"name": "math"}]}
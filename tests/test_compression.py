@@ -0,0 +1,142 @@
+import gzip
+
+import pytest
+from conftest import auth_headers
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.compression import (
+    ENCODINGS,
+    CompressionMiddleware,
+    PrecompressedBody,
+    _StreamCompressor,
+    compress,
+    negotiate,
+)
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.users import User
+
+
+def test_negotiate_honours_quality_values() -> None:
+    assert negotiate("gzip") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("br, deflate") is None
+    assert negotiate("") is None
+    assert negotiate("*") == ENCODINGS[0]
+    if "zstd" in ENCODINGS:
+        assert negotiate("gzip, zstd") == "zstd"
+        assert negotiate("gzip, zstd;q=0.5") == "gzip"
+
+
+def test_precompressed_body_compresses_once() -> None:
+    body = PrecompressedBody(b'{"items": []}' * 100)
+    first = body.encoded("gzip")
+    assert body.encoded("gzip") is first
+    assert gzip.decompress(first) == body.raw
+
+
+def stream_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    async def chunks():  # noqa: ANN202
+        for i in range(5):
+            yield f"line {i} " * 50 + "\n"
+
+    @app.get("/small")
+    async def small() -> PlainTextResponse:
+        return PlainTextResponse("tiny")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/events")
+    async def events() -> StreamingResponse:
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+def test_overlapping_zstd_streams_stay_decodable() -> None:
+    zstandard = pytest.importorskip("zstandard")
+    streams = [_StreamCompressor("zstd"), _StreamCompressor("zstd")]
+    outputs = [b"", b""]
+    for i in range(5):
+        for n, stream in enumerate(streams):
+            outputs[n] += stream.compress(b"stream %d chunk %d\n" % (n, i) * 50, False)
+        # a precompressed body made while both streams are open
+        single = compress(b"one-shot body " * 100, "zstd")
+        assert (
+            zstandard.ZstdDecompressor().decompress(single) == b"one-shot body " * 100
+        )
+    for n, stream in enumerate(streams):
+        outputs[n] += stream.compress(b"", True)
+
+    for n, output in enumerate(outputs):
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(output)
+        assert data == b"".join(b"stream %d chunk %d\n" % (n, i) * 50 for i in range(5))
+
+
+@pytest.mark.asyncio
+async def test_middleware_streams_and_skips_small_and_sse() -> None:
+    transport = ASGITransport(app=stream_app())
+    headers = {"Accept-Encoding": "gzip"}
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/stream", headers=headers)
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text.count("\n") == 5
+
+        response = await client.get("/small", headers=headers)
+        assert "content-encoding" not in response.headers
+        assert response.text == "tiny"
+
+        response = await client.get("/events", headers=headers)
+        assert "content-encoding" not in response.headers
+
+
+@pytest.fixture
+async def teacher(session: AsyncSession) -> User:
+    teacher = User(
+        name="Teacher",
+        bio="",
+        email="teacher@example.com",
+        role="teacher",
+        hashed_password="pw",
+    )
+    category = Category(name="math")
+    session.add_all([teacher, category])
+    await session.commit()
+    session.add_all(
+        Course(
+            title=f"Course {i}",
+            description="A long enough description to fill the page " * 3,
+            video_id=f"v{i}",
+            category_id=category.id,
+            author_id=teacher.id,
+        )
+        for i in range(20)
+    )
+    await session.commit()
+    return teacher
+
+
+@pytest.mark.asyncio
+async def test_course_page_is_served_precompressed(
+    client: AsyncClient, teacher: User
+) -> None:
+    headers = {**auth_headers(teacher), "Accept-Encoding": "gzip"}
+    response = await client.get("/courses/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()["items"]) == 20
+
+    headers["Accept-Encoding"] = "identity"
+    response = await client.get("/courses/", headers=headers)
+    assert "content-encoding" not in response.headers
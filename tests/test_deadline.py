@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.routing import APIRoute
+from httpx import ASGITransport, AsyncClient
+
+from app.deadline import deadline, route_deadline
+from app.main import app as main_app
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow")
+    @deadline(0.05)
+    async def slow(request: Request) -> dict:
+        await asyncio.sleep(1)
+        return {"ok": True}
+
+    @app.get("/budget")
+    @deadline(3)
+    async def budget(request: Request) -> dict:
+        return {"deadline": route_deadline(request)}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_deadline_exceeded_returns_504() -> None:
+    transport = ASGITransport(app=build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/slow")
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+
+
+@pytest.mark.asyncio
+async def test_route_deadline_visible_to_dependencies() -> None:
+    transport = ASGITransport(app=build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/budget")
+    assert response.json() == {"deadline": 3}
+
+
+def test_deadline_survives_limiter_decorator() -> None:
+    endpoints = {
+        route.endpoint.__name__: route.endpoint
+        for route in main_app.routes
+        if isinstance(route, APIRoute)
+    }
+    assert endpoints["get_users"].deadline_seconds == 5
+    assert endpoints["create_course"].deadline_seconds == 10
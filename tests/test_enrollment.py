@@ -0,0 +1,120 @@
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.counters import enrollment_counter
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.users import User
+
+
+@pytest.fixture
+async def course_setup(session: AsyncSession) -> dict:
+    enrollment_counter.clear()
+    teacher = User(
+        name="Teacher",
+        bio="",
+        email="teacher@example.com",
+        role="teacher",
+        hashed_password="pw",
+    )
+    students = [
+        User(
+            name=f"Student {i}",
+            bio="",
+            email=f"student{i}@example.com",
+            role="student",
+            hashed_password="pw",
+        )
+        for i in range(3)
+    ]
+    category = Category(name="math")
+    session.add_all([teacher, *students, category])
+    await session.commit()
+
+    courses = [
+        Course(
+            title=f"Course {i}",
+            description="Desc",
+            video_id=f"v{i}",
+            category_id=category.id,
+            author_id=teacher.id,
+        )
+        for i in range(3)
+    ]
+    session.add_all(courses)
+    await session.commit()
+    return {"teacher": teacher, "students": students, "courses": courses}
+
+
+@pytest.mark.asyncio
+async def test_enroll_and_unenroll(
+    client: AsyncClient, session: AsyncSession, course_setup: dict
+) -> None:
+    student = course_setup["students"][0]
+    course = course_setup["courses"][0]
+    headers = auth_headers(student)
+
+    response = await client.post(f"/enrollments/{course.id}", headers=headers)
+    assert response.status_code == 201
+    assert response.json()["course_id"] == course.id
+    assert enrollment_counter.pending(course.id) == 1
+
+    duplicate = await client.post(f"/enrollments/{course.id}", headers=headers)
+    assert duplicate.status_code == 400
+
+    response = await client.delete(f"/enrollments/{course.id}", headers=headers)
+    assert response.status_code == 204
+    assert enrollment_counter.pending(course.id) == 0
+
+    response = await client.delete(f"/enrollments/{course.id}", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_my_courses_keyset_pagination(
+    client: AsyncClient, session: AsyncSession, course_setup: dict
+) -> None:
+    headers = auth_headers(course_setup["students"][0])
+    for course in course_setup["courses"]:
+        await client.post(f"/enrollments/{course.id}", headers=headers)
+
+    first = (await client.get("/enrollments/me?limit=2", headers=headers)).json()
+    assert [c["title"] for c in first["items"]] == ["Course 0", "Course 1"]
+    assert first["next_after"] == course_setup["courses"][1].id
+
+    second = (
+        await client.get(
+            f"/enrollments/me?limit=2&after={first['next_after']}", headers=headers
+        )
+    ).json()
+    assert [c["title"] for c in second["items"]] == ["Course 2"]
+    assert second["next_after"] is None
+
+
+@pytest.mark.asyncio
+async def test_roster_and_batched_counter(
+    client: AsyncClient, session: AsyncSession, course_setup: dict
+) -> None:
+    course = course_setup["courses"][0]
+    for student in course_setup["students"]:
+        await client.post(f"/enrollments/{course.id}", headers=auth_headers(student))
+
+    teacher_headers = auth_headers(course_setup["teacher"])
+    roster = (
+        await client.get(f"/enrollments/courses/{course.id}", headers=teacher_headers)
+    ).json()
+    assert len(roster["items"]) == 3
+    assert roster["enrollment_count"] == 3
+
+    assert await enrollment_counter.flush(session) == 1
+    await session.refresh(course)
+    assert course.enrollment_count == 3
+    assert enrollment_counter.pending(course.id) == 0
+
+    forbidden = await client.get(
+        f"/enrollments/courses/{course.id}",
+        headers=auth_headers(course_setup["students"][0]),
+    )
+    assert forbidden.status_code == 403
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.idempotency import IdempotencyStore
+from app.models.categories import Category
+
+
+async def count_categories(session: AsyncSession) -> int:
+    return await session.scalar(select(func.count(Category.id)))
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_first_response(
+    client: AsyncClient, session: AsyncSession, admin_headers: dict[str, str]
+) -> None:
+    headers = {**admin_headers, "Idempotency-Key": "create-physics-1"}
+    first = await client.post("/categories/", json={"name": "Physics"}, headers=headers)
+    retry = await client.post("/categories/", json={"name": "Physics"}, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert first.json() == retry.json()
+    assert await count_categories(session) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_original(
+    client: AsyncClient, session: AsyncSession, admin_headers: dict[str, str]
+) -> None:
+    headers = {**admin_headers, "Idempotency-Key": "create-chemistry-1"}
+    responses = await asyncio.gather(
+        *(
+            client.post("/categories/", json={"name": "Chemistry"}, headers=headers)
+            for _ in range(3)
+        )
+    )
+
+    assert [r.status_code for r in responses] == [201, 201, 201]
+    assert await count_categories(session) == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reuse_with_different_body_rejected(
+    client: AsyncClient, session: AsyncSession, admin_headers: dict[str, str]
+) -> None:
+    headers = {**admin_headers, "Idempotency-Key": "create-biology-1"}
+    await client.post("/categories/", json={"name": "Biology"}, headers=headers)
+    response = await client.post(
+        "/categories/", json={"name": "Geology"}, headers=headers
+    )
+
+    assert response.status_code == 422
+    assert await count_categories(session) == 1
+
+
+@pytest.mark.asyncio
+async def test_store_is_bounded_and_expires() -> None:
+    store = IdempotencyStore(max_entries=2, ttl=60)
+
+    async def make(value: str) -> str:
+        return value
+
+    for key in ("a", "b", "c"):
+        await store.run(key, "fp", lambda key=key: make(key))
+    assert len(store) == 2
+
+    # a failed original is forgotten so the retry runs again
+    async def fail() -> str:
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await store.run("d", "fp", fail)
+    assert await store.run("d", "fp", lambda: make("retried")) == "retried"
+
+    expired = IdempotencyStore(max_entries=10, ttl=0)
+    await expired.run("a", "fp", lambda: make("first"))
+    assert await expired.run("a", "fp", lambda: make("second")) == "second"
+
+
+@pytest.mark.asyncio
+async def test_bound_never_evicts_a_request_in_flight() -> None:
+    store = IdempotencyStore(max_entries=1, ttl=60)
+    release = asyncio.Event()
+    calls = 0
+
+    async def slow() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "slow"
+
+    async def make(value: str) -> str:
+        return value
+
+    original = asyncio.create_task(store.run("a", "fp", slow))
+    await asyncio.sleep(0)
+    # over the bound while "a" is running: the store grows instead
+    assert await store.run("b", "fp", lambda: make("b")) == "b"
+    assert len(store) == 2
+    retry = asyncio.create_task(store.run("a", "fp", slow))
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(original, retry) == ["slow", "slow"]
+    assert calls == 1
+
+    # once it has finished, the bound applies again
+    await store.run("c", "fp", lambda: make("c"))
+    assert len(store) == 1
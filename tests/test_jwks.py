@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import jwt
+import pytest
+from httpx import AsyncClient
+from pydantic import SecretStr
+
+from app.auth.keys import KeyRing, generate_key, load_signing_key
+
+pytest.importorskip("cryptography")
+
+SECRET = SecretStr("shared-secret-for-tests-0123456789")
+
+
+def test_tokens_verify_from_published_jwks(tmp_path: Path) -> None:
+    key_path = generate_key(tmp_path)
+    keyring = KeyRing([load_signing_key(key_path)], None, SECRET, "HS256")
+    token = keyring.encode({"sub": "a@example.com"})
+
+    header = jwt.get_unverified_header(token)
+    assert header == {"alg": "EdDSA", "kid": key_path.stem, "typ": "JWT"}
+    assert keyring.decode(token)["sub"] == "a@example.com"
+
+    # what a downstream service does with the JWKS document
+    jwks = jwt.PyJWKSet.from_json(keyring.jwks_json.decode())
+    public = jwks[header["kid"]]
+    assert jwt.decode(token, public.key, algorithms=[public.algorithm_name])
+
+
+def test_rotation_keeps_old_tokens_valid(tmp_path: Path) -> None:
+    old = load_signing_key(generate_key(tmp_path / "old"))
+    new = load_signing_key(generate_key(tmp_path / "new", rsa_key=True))
+    old_token = KeyRing([old], None, SECRET, "HS256").encode({"sub": "x"})
+
+    keyring = KeyRing([old, new], new.kid, SECRET, "HS256")
+    assert jwt.get_unverified_header(keyring.encode({"sub": "x"}))["alg"] == "RS256"
+    assert keyring.decode(old_token)["sub"] == "x"
+
+    retired = KeyRing([new], None, SECRET, "HS256")
+    with pytest.raises(jwt.InvalidTokenError):
+        retired.decode(old_token)
+
+
+def test_shared_secret_tokens_can_be_turned_off(tmp_path: Path) -> None:
+    key = load_signing_key(generate_key(tmp_path))
+    legacy = jwt.encode({"sub": "x"}, SECRET.get_secret_value(), "HS256")
+
+    assert KeyRing([key], None, SECRET, "HS256").decode(legacy)["sub"] == "x"
+    strict = KeyRing([key], None, SECRET, "HS256", accept_shared_secret=False)
+    with pytest.raises(jwt.InvalidTokenError):
+        strict.decode(legacy)
+
+
+@pytest.mark.asyncio
+async def test_jwks_endpoint_is_cacheable(client: AsyncClient) -> None:
+    response = await client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+    assert "max-age" in response.headers["cache-control"]
+
+    etag = response.headers["etag"]
+    response = await client.get(
+        "/.well-known/jwks.json", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
@@ -0,0 +1,96 @@
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.counters import view_counter
+from app.leaderboard import Leaderboard, leaderboard
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.users import User
+
+
+@pytest.fixture
+async def catalog(session: AsyncSession) -> dict:
+    view_counter.clear()
+    user = User(
+        name="Student",
+        bio="",
+        email="student@example.com",
+        role="student",
+        hashed_password="pw",
+    )
+    math, art = Category(name="math"), Category(name="art")
+    session.add_all([user, math, art])
+    await session.commit()
+    courses = [
+        Course(
+            title=title,
+            description="Desc",
+            video_id=title,
+            category_id=category.id,
+            author_id=user.id,
+            view_count=views,
+        )
+        for title, category, views in [
+            ("algebra", math, 5),
+            ("geometry", math, 50),
+            ("calculus", math, 20),
+            ("drawing", art, 30),
+        ]
+    ]
+    session.add_all(courses)
+    await session.commit()
+    return {
+        "math": math,
+        "art": art,
+        "courses": courses,
+        "headers": auth_headers(user),
+    }
+
+
+@pytest.mark.asyncio
+async def test_course_views_are_counted_then_flushed(
+    client: AsyncClient, session: AsyncSession, catalog: dict
+) -> None:
+    course = catalog["courses"][0]
+    for _ in range(3):
+        response = await client.get(f"/courses/{course.id}", headers=catalog["headers"])
+        assert response.status_code == 200
+        assert response.json()["title"] == "algebra"
+    assert view_counter.pending(course.id) == 3
+
+    await view_counter.flush(session)
+    await session.refresh(course)
+    assert course.view_count == 8
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_per_category_and_overall(
+    session: AsyncSession, catalog: dict
+) -> None:
+    board = Leaderboard(size=2)
+    await board.refresh(session)
+
+    assert [c["title"] for c in board.top(catalog["math"].id)] == [
+        "geometry",
+        "calculus",
+    ]
+    assert [c["title"] for c in board.top(catalog["art"].id)] == ["drawing"]
+    assert [c["title"] for c in board.top()] == ["geometry", "drawing"]
+    assert board.generated_at is not None
+
+
+@pytest.mark.asyncio
+async def test_popular_endpoint_serves_snapshot(
+    client: AsyncClient, session: AsyncSession, catalog: dict
+) -> None:
+    await leaderboard.refresh(session)
+    response = await client.get(
+        f"/courses/popular?category_id={catalog['math'].id}",
+        headers=catalog["headers"],
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["courses"][0]["title"] == "geometry"
+    assert body["generated_at"] is not None
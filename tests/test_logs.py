@@ -0,0 +1,79 @@
+import io
+import json
+import logging
+
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logs import AccessLogMiddleware, LogWriter
+from app.models.categories import Category
+from app.models.users import User
+
+
+def test_writer_thread_emits_json_lines() -> None:
+    stream = io.StringIO()
+    writer = LogWriter(max_queue=100, stream=stream)
+    logger = logging.getLogger("tests.logs")
+    logger.addHandler(writer.handler)
+    logger.propagate = False
+    writer.start()
+    try:
+        logger.warning("user %s", "alice", extra={"route": "/users/"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        writer.stop()
+        logger.removeHandler(writer.handler)
+
+    first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert first["message"] == "user alice"
+    assert first["level"] == "WARNING"
+    assert first["route"] == "/users/"
+    assert "ValueError: boom" in second["exc_info"]
+
+
+def test_full_queue_drops_instead_of_blocking() -> None:
+    writer = LogWriter(max_queue=1, stream=io.StringIO())
+    record = logging.makeLogRecord({"msg": "hello"})
+    for _ in range(3):
+        writer.handler.handle(record)
+    assert writer.dropped == 2
+
+
+def test_only_fast_successful_reads_are_sampled() -> None:
+    middleware = AccessLogMiddleware(None, sample_rate=0.0, slow_ms=100)  # type: ignore[arg-type]
+    assert middleware.sampled_out("GET", 200, 5)
+    assert not middleware.sampled_out("POST", 201, 5)
+    assert not middleware.sampled_out("GET", 404, 5)
+    assert not middleware.sampled_out("GET", 200, 500)
+    assert not AccessLogMiddleware(None).sampled_out("GET", 200, 5)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_access_log_line(
+    client: AsyncClient, session: AsyncSession, caplog: pytest.LogCaptureFixture
+) -> None:
+    admin = User(
+        name="Admin",
+        bio="",
+        email="admin@example.com",
+        role="admin",
+        hashed_password="pw",
+    )
+    session.add_all([admin, Category(name="math")])
+    await session.commit()
+
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        response = await client.get("/categories/", headers=auth_headers(admin))
+    assert response.json() == {"category": [{"name": "math"}]}
+
+    (record,) = [r for r in caplog.records if r.name == "app.access"]
+    assert record.route == "/categories/"
+    assert record.status == response.status_code
+    assert record.user_id == str(admin.id)
+    assert record.db_queries >= 1
+    assert record.latency_ms >= record.db_ms > 0
@@ -0,0 +1,68 @@
+import io
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.online_migrations import (
+    backfill,
+    create_index_concurrently,
+    drop_index_concurrently,
+    lock_timeout,
+)
+
+
+def test_backfill_and_index_on_sqlite(tmp_path: Path) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'm.db'}")
+    with engine.connect() as conn:
+        conn.exec_driver_sql("CREATE TABLE course (id INTEGER PRIMARY KEY, level TEXT)")
+        conn.exec_driver_sql(
+            "INSERT INTO course (id, level) VALUES"
+            " (1, NULL), (2, 'expert'), (3, NULL), (4, NULL), (5, NULL)"
+        )
+        conn.commit()
+
+        migration = MigrationContext.configure(conn)
+        with Operations.context(migration), migration.begin_transaction():
+            with lock_timeout(100):
+                filled = backfill(
+                    "course",
+                    {"level": "beginner"},
+                    where="level IS NULL",
+                    batch_size=2,
+                    pause_seconds=0,
+                )
+            create_index_concurrently("ix_course_level", "course", ["level"])
+
+        assert filled == 4
+        rows = conn.exec_driver_sql("SELECT level FROM course ORDER BY id").all()
+        assert [level for (level,) in rows] == [
+            "beginner",
+            "expert",
+            "beginner",
+            "beginner",
+            "beginner",
+        ]
+        assert "ix_course_level" in {
+            index["name"] for index in sa.inspect(conn).get_indexes("course")
+        }
+
+        with Operations.context(migration), migration.begin_transaction():
+            drop_index_concurrently("ix_course_level", "course")
+        assert sa.inspect(conn).get_indexes("course") == []
+    engine.dispose()
+
+
+def test_lock_timeout_is_reset_when_a_step_fails() -> None:
+    buffer = io.StringIO()
+    migration = MigrationContext.configure(
+        dialect_name="postgresql", opts={"as_sql": True, "output_buffer": buffer}
+    )
+    with Operations.context(migration):
+        with pytest.raises(RuntimeError), lock_timeout(100):
+            raise RuntimeError("step failed")
+
+    statements = [line for line in buffer.getvalue().splitlines() if line.strip()]
+    assert statements == ["SET lock_timeout = 100;", "SET lock_timeout = DEFAULT;"]
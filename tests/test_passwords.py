@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.calibrate import calibrate, update_env_file
+from app.auth.utilits import authenticate_user
+from app.env_loader import settings
+from app.models.users import User
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_parameters(session: AsyncSession) -> None:
+    cheap = Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1)
+    user = User(
+        name="Old",
+        bio="",
+        email="old@example.com",
+        role="student",
+        hashed_password=cheap.hash("password123"),
+    )
+    session.add(user)
+    await session.commit()
+
+    await authenticate_user(session, "old@example.com", "password123")
+    await session.refresh(user)
+    expected = (
+        f"m={settings.argon2_memory_cost_kib},"
+        f"t={settings.argon2_time_cost},"
+        f"p={settings.argon2_parallelism}"
+    )
+    assert expected in user.hashed_password
+
+    # current parameters: nothing to update
+    stored = user.hashed_password
+    await authenticate_user(session, "old@example.com", "password123")
+    assert user.hashed_password == stored
+
+
+def test_calibrate_stays_within_bounds() -> None:
+    params = calibrate(
+        target_ms=1000,
+        max_memory_kib=1024,
+        min_memory_kib=512,
+        parallelism=1,
+        samples=1,
+    )
+    assert params.time_cost >= 1
+    assert 512 <= params.memory_cost_kib <= 1024
+
+
+def test_update_env_file_keeps_other_lines(tmp_path: Path) -> None:
+    env = tmp_path / ".env"
+    env.write_text("secret_key=s3cret\nARGON2_TIME_COST=3\n")
+    update_env_file(env, {"argon2_time_cost": "2", "argon2_parallelism": "1"})
+    assert env.read_text() == (
+        "secret_key=s3cret\nargon2_time_cost=2\nargon2_parallelism=1\n"
+    )
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+from httpx import AsyncClient
+
+from app.env_loader import settings
+from app.profiling import SamplingProfiler
+
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_collapses_stacks_root_first() -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    worker.start()
+    profiler = SamplingProfiler(interval=0.001)
+    try:
+        for _ in range(5):
+            profiler.sample()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profiler.samples == 5
+    busy = [s for s in profiler.stacks if s.startswith("busy;")]
+    assert busy and all("busy_loop (" in s for s in busy)
+    for line in profiler.collapsed().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_profiling_is_off_by_default(
+    client: AsyncClient, admin_headers: dict[str, str]
+) -> None:
+    response = await client.get("/admin/profile/cpu", headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cpu_and_memory_profiles(
+    client: AsyncClient,
+    admin_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+
+    response = await client.get(
+        "/admin/profile/cpu?seconds=0.05&interval_ms=1", headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert int(response.headers["x-profile-samples"]) > 0
+    assert response.text.endswith("\n")
+
+    response = await client.get(
+        "/admin/profile/memory?seconds=0.01&limit=5", headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert len(response.json()) <= 5
+
+    response = await client.get(
+        "/admin/profile/cpu?seconds=3600", headers=admin_headers
+    )
+    assert response.status_code == 422
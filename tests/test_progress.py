@@ -0,0 +1,103 @@
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.progress import WatchProgress
+from app.models.users import User
+from app.progress import progress_buffer
+
+
+@pytest.fixture
+async def viewer(session: AsyncSession) -> dict:
+    progress_buffer.clear()
+    user = User(
+        name="Viewer",
+        bio="",
+        email="viewer@example.com",
+        role="student",
+        hashed_password="pw",
+    )
+    category = Category(name="math")
+    session.add_all([user, category])
+    await session.commit()
+    course = Course(
+        title="Algebra",
+        description="Desc",
+        video_id="v1",
+        category_id=category.id,
+        author_id=user.id,
+    )
+    session.add(course)
+    await session.commit()
+    return {
+        "user": user,
+        "course": course,
+        "headers": auth_headers(user),
+    }
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_are_coalesced_in_memory(
+    client: AsyncClient, session: AsyncSession, viewer: dict
+) -> None:
+    course_id = viewer["course"].id
+    for position in (10, 20, 30):
+        response = await client.put(
+            f"/progress/{course_id}",
+            json={"position_seconds": position},
+            headers=viewer["headers"],
+        )
+        assert response.status_code == 202
+
+    assert len(progress_buffer) == 1
+    assert await session.get(WatchProgress, (viewer["user"].id, course_id)) is None
+
+    response = await client.get(f"/progress/{course_id}", headers=viewer["headers"])
+    assert response.json()["position_seconds"] == 30
+
+
+@pytest.mark.asyncio
+async def test_flush_upserts_latest_position(
+    client: AsyncClient, session: AsyncSession, viewer: dict
+) -> None:
+    user_id, course_id = viewer["user"].id, viewer["course"].id
+    progress_buffer.record(user_id, course_id, 42)
+    assert await progress_buffer.flush(session) == 1
+
+    progress_buffer.record(user_id, course_id, 84)
+    assert await progress_buffer.flush(session) == 1
+    assert len(progress_buffer) == 0
+
+    stored = await session.get(WatchProgress, (user_id, course_id))
+    await session.refresh(stored)
+    assert stored.position_seconds == 84
+
+    response = await client.get(f"/progress/{course_id}", headers=viewer["headers"])
+    assert response.json()["position_seconds"] == 84
+
+
+@pytest.mark.asyncio
+async def test_flush_drops_rows_for_missing_course(
+    session: AsyncSession, viewer: dict
+) -> None:
+    # SQLite only enforces foreign keys when asked to
+    await session.execute(text("PRAGMA foreign_keys=ON"))
+    try:
+        progress_buffer.record(viewer["user"].id, viewer["course"].id, 5)
+        progress_buffer.record(viewer["user"].id, 9999, 5)
+
+        assert await progress_buffer.flush(session) == 1
+    finally:
+        await session.execute(text("PRAGMA foreign_keys=OFF"))
+
+
+@pytest.mark.asyncio
+async def test_progress_not_found(
+    client: AsyncClient, session: AsyncSession, viewer: dict
+) -> None:
+    response = await client.get("/progress/9999", headers=viewer["headers"])
+    assert response.status_code == 404
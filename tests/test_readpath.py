@@ -0,0 +1,84 @@
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.users import User
+
+
+@pytest.fixture
+async def admin(session: AsyncSession) -> User:
+    admin = User(
+        name="Admin",
+        bio="",
+        email="admin@example.com",
+        role="admin",
+        hashed_password="pw",
+    )
+    category = Category(name="math")
+    session.add_all([admin, category])
+    await session.commit()
+    session.add(
+        Course(
+            title="Algebra",
+            description="Desc",
+            video_id="v1",
+            category_id=category.id,
+            author_id=admin.id,
+        )
+    )
+    await session.commit()
+    return admin
+
+
+@pytest.mark.asyncio
+async def test_users_page_from_columns(client: AsyncClient, admin: User) -> None:
+    response = await client.get("/users/", headers=auth_headers(admin))
+    assert response.status_code == 200
+    (item,) = response.json()["items"]
+    assert item == {
+        "name": "Admin",
+        "bio": "",
+        "email": "admin@example.com",
+        "role": "admin",
+        "id": admin.id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_courses_and_categories_from_columns(
+    client: AsyncClient, admin: User
+) -> None:
+    headers = auth_headers(admin)
+    response = await client.get("/courses/", headers=headers)
+    assert response.status_code == 200
+    (course,) = response.json()["items"]
+    assert course["title"] == "Algebra"
+    assert course["author_id"] == admin.id
+
+    response = await client.get("/categories/", headers=headers)
+    assert response.json() == {"category": [{"name": "math"}]}
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_take_no_connection(client: AsyncClient, admin: User) -> None:
+    checkouts = 0
+
+    def count(*args: object) -> None:
+        nonlocal checkouts
+        checkouts += 1
+
+    event.listen(database.engine.sync_engine, "checkout", count)
+    try:
+        for path in ("/courses/", "/categories/"):
+            for _ in range(5):
+                await client.get(path, headers=auth_headers(admin))
+    finally:
+        event.remove(database.engine.sync_engine, "checkout", count)
+
+    # auth reads no rows, so only the two misses reach the pool
+    assert checkouts == 2
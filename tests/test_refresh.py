@@ -0,0 +1,118 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.utilits import REFRESH_COOKIE, build_login_response, hash_password
+from app.env_loader import settings
+from app.models.tokens import RevokedToken
+from app.models.users import User
+from app.revocation import BloomFilter, RevocationList
+
+
+@pytest.fixture
+async def user(session: AsyncSession) -> User:
+    user = User(
+        name="Student",
+        bio="",
+        email="student@example.com",
+        role="student",
+        hashed_password=hash_password("password123"),
+    )
+    session.add(user)
+    await session.commit()
+    return user
+
+
+async def login(client: AsyncClient) -> tuple[str, str]:
+    response = await client.post(
+        "/auth/login",
+        json={"email": "student@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    return response.cookies["access_token"], response.cookies[REFRESH_COOKIE]
+
+
+def cookies(access: str | None = None, refresh: str | None = None) -> dict:
+    pairs = [("access_token", access), (REFRESH_COOKIE, refresh)]
+    return {"Cookie": "; ".join(f"{k}={v}" for k, v in pairs if v)}
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    members = [f"member-{i}" for i in range(1000)]
+    for member in members:
+        bloom.add(member)
+    assert all(member in bloom for member in members)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_and_rejects_replay(
+    client: AsyncClient, user: User
+) -> None:
+    access, refresh = await login(client)
+
+    response = await client.post("/auth/refresh", headers=cookies(refresh=refresh))
+    assert response.status_code == 200
+    new_access = response.cookies["access_token"]
+    assert response.cookies[REFRESH_COOKIE] != refresh
+
+    response = await client.post("/auth/refresh", headers=cookies(refresh=refresh))
+    assert response.status_code == 401
+
+    response = await client.get("/categories/", headers=cookies(access=new_access))
+    assert response.status_code == 302
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(
+    client: AsyncClient, user: User
+) -> None:
+    _, refresh = await login(client)
+    response = await client.get("/categories/", headers=cookies(access=refresh))
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_both_tokens(client: AsyncClient, user: User) -> None:
+    access, refresh = await login(client)
+    response = await client.post(
+        "/auth/logout", headers=cookies(access=access, refresh=refresh)
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/categories/", headers=cookies(access=access))
+    assert response.status_code == 401
+    response = await client.post("/auth/refresh", headers=cookies(refresh=refresh))
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_rebuild_purges_expired_rows(session: AsyncSession) -> None:
+    now = datetime.now(UTC)
+    session.add_all(
+        [
+            RevokedToken(jti="live", expires_at=now + timedelta(hours=1)),
+            RevokedToken(jti="expired", expires_at=now - timedelta(hours=1)),
+        ]
+    )
+    await session.commit()
+
+    revocations = RevocationList(capacity=100, error_rate=0.01)
+    assert await revocations.rebuild(session) == 1
+    result = await session.execute(select(RevokedToken.jti))
+    assert result.scalars().all() == ["live"]
+
+
+@pytest.mark.parametrize("secure", [True, False])
+def test_auth_cookies_follow_cookie_secure(
+    monkeypatch: pytest.MonkeyPatch, secure: bool
+) -> None:
+    monkeypatch.setattr(settings, "cookie_secure", secure)
+    cookies = build_login_response("access", "refresh").headers.getlist("set-cookie")
+    assert len(cookies) == 2
+    assert all(("; secure" in cookie.lower()) is secure for cookie in cookies)
@@ -0,0 +1,239 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from conftest import auth_headers
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.broadcast import hub
+from app.counters import enrollment_counter
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.enrollments import Enrollment
+from app.models.soft_delete import include_deleted
+from app.models.users import User
+from app.purge import Purger, in_window
+from app.routers.course import COURSE_TOPIC
+
+
+@pytest.fixture
+async def people(session: AsyncSession) -> dict:
+    admin = User(
+        name="Admin",
+        bio="",
+        email="admin@example.com",
+        role="admin",
+        hashed_password="pw",
+    )
+    teacher = User(
+        name="Teacher",
+        bio="",
+        email="teacher@example.com",
+        role="teacher",
+        hashed_password="pw",
+    )
+    math = Category(name="math")
+    session.add_all([admin, teacher, math])
+    await session.commit()
+    courses = [
+        Course(
+            title=title,
+            description="Desc",
+            video_id=title,
+            category_id=math.id,
+            author_id=teacher.id,
+        )
+        for title in ("algebra", "geometry")
+    ]
+    session.add_all(courses)
+    await session.commit()
+    session.add(Enrollment(user_id=admin.id, course_id=courses[0].id))
+    await session.commit()
+    return {"admin": admin, "teacher": teacher, "courses": courses}
+
+
+async def count(session: AsyncSession, model: type) -> int:
+    query = include_deleted(select(func.count()).select_from(model))
+    return await session.scalar(query)  # type: ignore[return-value]
+
+
+@pytest.mark.asyncio
+async def test_deleted_course_is_hidden_but_kept(
+    client: AsyncClient, session: AsyncSession, people: dict
+) -> None:
+    algebra = people["courses"][0]
+    headers = auth_headers(people["teacher"])
+
+    response = await client.delete(f"/courses/{algebra.id}", headers=headers)
+    assert response.status_code == 204
+
+    assert (
+        await client.get(f"/courses/{algebra.id}", headers=headers)
+    ).status_code == 404
+    response = await client.get("/courses/", headers=headers)
+    assert [c["title"] for c in response.json()["items"]] == ["geometry"]
+    response = await client.get(
+        "/enrollments/me", headers=auth_headers(people["admin"])
+    )
+    assert response.json()["items"] == []
+    # still there until the purger runs
+    assert await count(session, Course) == 2
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_takes_their_courses_and_frees_the_email(
+    client: AsyncClient, session: AsyncSession, people: dict
+) -> None:
+    teacher = people["teacher"]
+    headers = auth_headers(people["admin"])
+
+    subscription = hub.subscribe(COURSE_TOPIC)
+    try:
+        response = await client.delete(f"/users/{teacher.id}", headers=headers)
+        assert response.status_code == 204
+        messages = [subscription.queue.get_nowait() for _ in people["courses"]]
+    finally:
+        hub.unsubscribe(subscription)
+    assert {message["event"] for message in messages} == {"course.deleted"}
+    assert sorted(message["data"]["id"] for message in messages) == sorted(
+        course.id for course in people["courses"]
+    )
+
+    response = await client.get(f"/users/batch?ids={teacher.id}", headers=headers)
+    assert response.json()["items"] == []
+    response = await client.get("/courses/", headers=headers)
+    assert response.json()["total"] == 0
+
+    session.add(
+        User(
+            name="Teacher",
+            bio="",
+            email=teacher.email,
+            role="teacher",
+            hashed_password="pw",
+        )
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_purger_removes_rows_after_retention(
+    session: AsyncSession, people: dict
+) -> None:
+    deleted_at = datetime.now(UTC)
+    people["teacher"].deleted_at = deleted_at
+    for course in people["courses"]:
+        course.deleted_at = deleted_at
+    await session.commit()
+
+    purger = Purger(timedelta(hours=1), batch_size=1, pause=0, max_batches=10)
+    assert await purger.run(session, deleted_at + timedelta(minutes=30)) == {
+        "course": 0,
+        "user": 0,
+    }
+    assert await purger.run(session, deleted_at + timedelta(hours=2)) == {
+        "course": 2,
+        "user": 1,
+    }
+    assert await count(session, Course) == 0
+    assert await count(session, User) == 1
+    assert await count(session, Enrollment) == 0
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_stops_counting_towards_enrollments(
+    client: AsyncClient, session: AsyncSession, people: dict
+) -> None:
+    enrollment_counter.clear()
+    algebra = people["courses"][0]
+    student = User(
+        name="Student",
+        bio="",
+        email="student@example.com",
+        role="student",
+        hashed_password="pw",
+    )
+    session.add(student)
+    await session.commit()
+    session.add(Enrollment(user_id=student.id, course_id=algebra.id))
+    algebra.enrollment_count = 2
+    await session.commit()
+
+    response = await client.delete(
+        f"/users/{student.id}", headers=auth_headers(people["admin"])
+    )
+    assert response.status_code == 204
+    await enrollment_counter.flush(session)
+    await session.refresh(algebra)
+    assert algebra.enrollment_count == 1
+
+    purger = Purger(timedelta(hours=1), batch_size=10, pause=0, max_batches=10)
+    purged = await purger.run(session, datetime.now(UTC) + timedelta(hours=2))
+    assert purged == {"course": 0, "user": 1}
+    await enrollment_counter.flush(session)
+    await session.refresh(algebra)
+    assert algebra.enrollment_count == await count(session, Enrollment) == 1
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_tokens_stop_working(
+    client: AsyncClient, session: AsyncSession, people: dict
+) -> None:
+    enrollment_counter.clear()
+    algebra, geometry = people["courses"]
+    student = User(
+        name="Student",
+        bio="",
+        email="student@example.com",
+        role="student",
+        hashed_password="pw",
+    )
+    session.add(student)
+    await session.commit()
+    session.add(Enrollment(user_id=student.id, course_id=algebra.id))
+    algebra.enrollment_count = 2
+    await session.commit()
+    admin = auth_headers(people["admin"])
+    student_headers = auth_headers(student)
+    teacher_headers = auth_headers(people["teacher"])
+
+    for user in (student, people["teacher"]):
+        response = await client.delete(f"/users/{user.id}", headers=admin)
+        assert response.status_code == 204
+    await enrollment_counter.flush(session)
+    await session.refresh(algebra)
+    assert algebra.enrollment_count == 1
+
+    response = await client.delete(
+        f"/enrollments/{algebra.id}", headers=student_headers
+    )
+    assert response.status_code == 401
+    response = await client.post(f"/enrollments/{geometry.id}", headers=student_headers)
+    assert response.status_code == 401
+    response = await client.post(
+        "/courses/",
+        json={
+            "title": "ghost",
+            "description": "Desc",
+            "video_id": "ghost",
+            "category": "math",
+        },
+        headers=teacher_headers,
+    )
+    assert response.status_code == 401
+    await enrollment_counter.flush(session)
+    await session.refresh(algebra)
+    assert algebra.enrollment_count == 1
+    assert await count(session, Course) == 2
+    # other users are unaffected
+    assert (await client.get("/users/", headers=admin)).status_code == 200
+
+
+def test_off_peak_window_may_wrap_midnight() -> None:
+    at = datetime(2026, 1, 1, tzinfo=UTC)
+    assert in_window(at.replace(hour=3), 2, 5)
+    assert not in_window(at.replace(hour=5), 2, 5)
+    assert in_window(at.replace(hour=23), 22, 4)
+    assert in_window(at.replace(hour=1), 22, 4)
+    assert not in_window(at.replace(hour=12), 22, 4)
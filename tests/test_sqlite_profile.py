@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import database
+from app.database import Base, RoutingSession, is_sqlite_file
+from app.models.categories import Category
+
+
+def test_profile_only_for_on_disk_sqlite() -> None:
+    assert is_sqlite_file("sqlite+aiosqlite:///data/app.db")
+    assert not is_sqlite_file("sqlite+aiosqlite:///:memory:")
+    assert not is_sqlite_file("sqlite+aiosqlite:///file:x?mode=memory&uri=true")
+    assert not is_sqlite_file("postgresql+asyncpg://u:p@localhost/db")
+
+
+@pytest.mark.asyncio
+async def test_reads_use_the_reader_pool_until_a_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    writer = create_async_engine(url, pool_size=1, max_overflow=0)
+    reader = create_async_engine(url, pool_size=2, max_overflow=0)
+    database._install_sqlite_profile(writer, read_only=False)
+    database._install_sqlite_profile(reader, read_only=True)
+    monkeypatch.setattr(database, "engine", writer)
+    monkeypatch.setattr(database, "read_engine", reader)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with reader.connect() as conn:
+        mode = await conn.exec_driver_sql("PRAGMA journal_mode")
+        assert mode.scalar() == "wal"
+        with pytest.raises(OperationalError):
+            await conn.exec_driver_sql("DELETE FROM category")
+
+    Session = async_sessionmaker(
+        class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+    )
+    async with Session() as db:
+        db.add(Category(name="math"))
+        await db.commit()
+        assert (await db.execute(select(Category.name))).all() == [("math",)]
+        assert "wrote" not in db.info
+
+        category = (await db.execute(select(Category))).scalar_one()
+        category.name = "art"
+        await db.flush()
+        # the flushed change isn't committed: only the writer can see it
+        assert (await db.execute(select(Category.name))).all() == [("art",)]
+        await db.commit()
+
+    await writer.dispose()
+    await reader.dispose()
@@ -0,0 +1,30 @@
+from fastapi import FastAPI
+
+from app.importtime import measure, parse_importtime
+from app.main import app, create_app
+
+
+def test_create_app_builds_independent_apps() -> None:
+    fresh = create_app()
+    assert isinstance(fresh, FastAPI)
+    assert fresh is not app
+    paths = {route.path for route in fresh.routes}
+    assert {"/courses/", "/auth/login", "/.well-known/jwks.json"} <= paths
+
+
+def test_parse_importtime() -> None:
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+    )
+    assert parse_importtime(stderr) == [
+        ("json.decoder", 120, 120),
+        ("json", 300, 420),
+    ]
+
+
+def test_measure_app_import() -> None:
+    timings = measure("app.main")
+    modules = {timing.module for timing in timings}
+    assert {"app.main", "app.database", "fastapi"} <= modules
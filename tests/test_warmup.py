@@ -0,0 +1,60 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import response_cache
+from app.env_loader import settings
+from app.main import app
+from app.models.categories import Category
+from app.models.courses import Course
+from app.models.users import User
+from app.warmup import WarmUp
+
+
+@pytest.mark.asyncio
+async def test_ready_only_after_warm_up(
+    client: AsyncClient, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    teacher = User(
+        name="Teacher",
+        bio="",
+        email="teacher@example.com",
+        role="teacher",
+        hashed_password="pw",
+    )
+    math = Category(name="math")
+    session.add_all([teacher, math])
+    await session.commit()
+    session.add(
+        Course(
+            title="algebra",
+            description="Desc",
+            video_id="v",
+            category_id=math.id,
+            author_id=teacher.id,
+        )
+    )
+    await session.commit()
+
+    warm_up = WarmUp()
+    monkeypatch.setattr("app.routers.health.warm_up", warm_up)
+    monkeypatch.setattr(settings, "warmup_roles", ["student"])
+    response = await client.get("/ready")
+    assert response.status_code == 503
+
+    warm_up.start(app)
+    await warm_up._task
+    assert warm_up.report["requests"] == {
+        "student /categories/": 302,
+        "student /courses/": 200,
+    }
+    assert warm_up.report["connections"]["writer"] >= 1
+    # both pages are now served from the cache
+    assert len(response_cache) == 2
+
+    response = await client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+    await warm_up.stop()
+    assert (await client.get("/ready")).status_code == 503